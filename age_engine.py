@@ -0,0 +1,348 @@
+"""Headless age calculations shared by the GUI and batch tools.
+
+Nothing in here imports PyQt6, so ages can be computed without a
+QApplication.  ``age_breakdown`` handles a single birth datetime and is what
+the result page uses; ``compute_ages`` does the same arithmetic over NumPy
+arrays of birth datetimes against one reference time, and
+``compute_zoned_ages`` adds per-row birth and reference time zones.
+
+Single results are ``AgeBreakdown`` objects and array results are an
+``AgeBatch``, a NumPy structured array with the same fields.  Neither
+keeps any text around; both format on demand.
+"""
+import datetime
+
+import numpy as np
+
+import calendar_tables
+import timezones
+from calendar_tables import to_days
+
+
+AGE_FIELDS = ('years', 'months', 'days', 'hours', 'minutes', 'seconds')
+# Negative years only come from births after the reference time
+AGE_DTYPE = np.dtype([('years', np.int16)] + [(name, np.uint8) for name in AGE_FIELDS[1:]])
+DEFAULT_AGE_FORMAT = ("{years} years, {months} months, {days} days\n"
+                      "{hours} hours, {minutes} minutes, {seconds} seconds")
+
+
+class AgeBreakdown:
+    """One person's age; unpacks like the (years, ..., seconds) tuple"""
+
+    __slots__ = AGE_FIELDS
+
+    def __init__(self, years, months, days, hours, minutes, seconds):
+        self.years = years
+        self.months = months
+        self.days = days
+        self.hours = hours
+        self.minutes = minutes
+        self.seconds = seconds
+
+    def __iter__(self):
+        return iter((self.years, self.months, self.days,
+                     self.hours, self.minutes, self.seconds))
+
+    def __eq__(self, other):
+        if isinstance(other, (AgeBreakdown, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "AgeBreakdown({})".format(
+            ", ".join(f"{name}={value}" for name, value in zip(AGE_FIELDS, self)))
+
+    def __str__(self):
+        return self.format()
+
+    def format(self, template=DEFAULT_AGE_FORMAT):
+        return template.format(years=self.years, months=self.months, days=self.days,
+                               hours=self.hours, minutes=self.minutes, seconds=self.seconds)
+
+
+class AgeBatch:
+    """Columnar ages: one ``AGE_DTYPE`` structured array.
+
+    Fields are read as ``batch.years`` and so on.  They are narrow integer
+    types (7 bytes per age), so cast before doing arithmetic that can
+    overflow; ``seconds_of_day`` does that for the time part.  Indexing one
+    element gives an ``AgeBreakdown``, slicing gives another ``AgeBatch``.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_columns(cls, years, months, days, hours, minutes, seconds):
+        years = np.asarray(years)
+        data = np.empty(years.shape, dtype=AGE_DTYPE)
+        for name, column in zip(AGE_FIELDS, (years, months, days, hours, minutes, seconds)):
+            data[name] = column
+        return cls(data)
+
+    years = property(lambda self: self.data['years'])
+    months = property(lambda self: self.data['months'])
+    days = property(lambda self: self.data['days'])
+    hours = property(lambda self: self.data['hours'])
+    minutes = property(lambda self: self.data['minutes'])
+    seconds = property(lambda self: self.data['seconds'])
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        item = self.data[key]
+        if isinstance(item, np.ndarray):
+            return AgeBatch(item)
+        return AgeBreakdown(*item.tolist())
+
+    def __iter__(self):
+        for row in self.data.tolist():
+            yield AgeBreakdown(*row)
+
+    def __repr__(self):
+        return f"AgeBatch(shape={self.shape})"
+
+    def columns(self):
+        """The fields as plain arrays, in ``AGE_FIELDS`` order"""
+        return tuple(self.data[name] for name in AGE_FIELDS)
+
+    def seconds_of_day(self):
+        """hours/minutes/seconds as int64 seconds"""
+        return (self.data['hours'].astype(np.int64) * 3600
+                + self.data['minutes'].astype(np.int64) * 60 + self.data['seconds'])
+
+    def format(self, template=DEFAULT_AGE_FORMAT):
+        """Lazily yield each age as text (flattened row order)"""
+        for years, months, days, hours, minutes, seconds in self.data.ravel().tolist():
+            yield template.format(years=years, months=months, days=days,
+                                  hours=hours, minutes=minutes, seconds=seconds)
+
+
+# Old name of the array result; the field attributes are unchanged
+AgeArrays = AgeBatch
+
+
+def elapsed(later, earlier):
+    """``later - earlier``; aware datetimes are compared as UTC instants"""
+    if later.tzinfo is not None and earlier.tzinfo is not None:
+        return (later.astimezone(datetime.timezone.utc)
+                - earlier.astimezone(datetime.timezone.utc))
+    return later - earlier
+
+
+def age_anchor(birth_datetime, current_date, feb29='mar1'):
+    """Return (years, months, anniversary) for one person.
+
+    ``anniversary`` is the datetime the whole years and months were
+    completed at; the rest of the age is the time elapsed since then.  For
+    time-zone aware datetimes the calendar is the one of ``current_date``'s
+    zone.
+    """
+    aware = birth_datetime.tzinfo is not None and current_date.tzinfo is not None
+    if aware:
+        birth_wall = birth_datetime.astimezone(current_date.tzinfo).replace(tzinfo=None)
+        now_wall = current_date.replace(tzinfo=None)
+    else:
+        birth_wall, now_wall = birth_datetime, current_date
+    steps, anniversary = calendar_tables.month_steps(birth_wall, now_wall, feb29)
+    if aware:
+        anniversary = anniversary.replace(tzinfo=current_date.tzinfo)
+    years, months = divmod(steps, 12)
+    return years, months, anniversary
+
+
+def age_breakdown(birth_datetime, current_date, feb29='mar1'):
+    """Return the ``AgeBreakdown`` of one person at ``current_date``.
+
+    Years and months are whole calendar steps from the birth date (see
+    ``calendar_tables`` for month ends and February 29th); days and the
+    time are what has elapsed since the last of them.  For time-zone aware
+    datetimes the calendar fields are taken in the zone of
+    ``current_date`` and the elapsed time is real (UTC) time, so DST
+    changes in between don't shift hours.
+    """
+    years, months, anniversary = age_anchor(birth_datetime, current_date, feb29)
+    delta = elapsed(current_date, anniversary)
+    seconds = delta.seconds
+    return AgeBreakdown(years, months, delta.days,
+                        seconds // 3600, (seconds % 3600) // 60, seconds % 60)
+
+
+def to_datetime64(values):
+    """Convert datetimes, ISO strings or datetime64 values to datetime64[s]"""
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'M':
+        return arr.astype('datetime64[s]')
+    if arr.dtype == object:
+        arr = np.array([np.datetime64(v, 's') for v in arr.ravel()],
+                       dtype='datetime64[s]').reshape(arr.shape)
+        return arr
+    return arr.astype('datetime64[s]')
+
+
+def split_date(values):
+    """Split datetime64 values into (year, month, day) integer arrays"""
+    years = values.astype('datetime64[Y]')
+    months = values.astype('datetime64[M]')
+    year = years.astype(np.int64) + 1970
+    month = (months - years).astype(np.int64) + 1
+    day = (values.astype('datetime64[D]') - months).astype(np.int64) + 1
+    return year, month, day
+
+
+def reference_time(now=None):
+    """datetime64[s] value(s) for ``now``; defaults to the current local time"""
+    if now is None:
+        now = datetime.datetime.now()
+    if isinstance(now, datetime.datetime) and now.tzinfo is not None:
+        now = now.replace(tzinfo=None)
+    return to_datetime64(now)
+
+
+def split_elapsed(elapsed):
+    """Split elapsed whole seconds into (days, hours, minutes, seconds)"""
+    days, seconds = np.divmod(elapsed, 86400)
+    hours, seconds = np.divmod(seconds, 3600)
+    minutes, seconds = np.divmod(seconds, 60)
+    return days, hours, minutes, seconds
+
+
+def compute_ages(birth, now=None, feb29='mar1'):
+    """Vectorised ``age_breakdown`` over an array of birth datetimes.
+
+    ``birth`` may be anything ``to_datetime64`` accepts; ``now`` is one
+    reference time (default: the current local time) or an array that
+    broadcasts against ``birth``.  Returns an ``AgeBatch`` of the
+    broadcast shape.  Sub-second precision is dropped, matching the
+    whole-second output of the result page.
+    """
+    birth = to_datetime64(birth)
+    now = reference_time(now)
+    years, months, anniversary = calendar_tables.ymd_difference(birth, now, feb29)
+    elapsed = (now - anniversary).astype(np.int64)
+    return AgeBatch.from_columns(years, months, *split_elapsed(elapsed))
+
+
+def compute_zoned_ages(birth, birth_zones, now_utc=None, ref_zones=None, feb29='mar1'):
+    """``compute_ages`` for wall-clock births in ``birth_zones``.
+
+    ``birth`` holds local birth times and ``birth_zones`` one zone name or
+    one per row; ``ref_zones`` likewise names the zone each age is reported
+    in.  ``now_utc`` is a naive UTC instant (default: now).  Years and
+    months are counted on the reference zone's calendar, while days and
+    h/m/s are the real time elapsed since then, so DST changes and zone
+    differences are accounted for.  Empty or ``None`` zones mean UTC.
+    """
+    birth_utc = timezones.to_utc(to_datetime64(birth), birth_zones)
+    now_utc = timezones.utc_now() if now_utc is None else reference_time(now_utc)
+    now_local = timezones.from_utc(np.broadcast_to(now_utc, birth_utc.shape), ref_zones)
+    birth_ref = timezones.from_utc(birth_utc, ref_zones)
+    years, months, anniversary = calendar_tables.ymd_difference(birth_ref, now_local, feb29)
+    # A wall time skipped by DST can map back a little after "now"
+    elapsed = np.maximum((now_utc - timezones.to_utc(anniversary, ref_zones)).astype(np.int64), 0)
+    return AgeBatch.from_columns(years, months, *split_elapsed(elapsed))
+
+
+REFERENCE_STEPS = ('day', 'month_start', 'month_end', 'year_start', 'year_end')
+
+
+def reference_dates(start, stop, step='month_end', every=1):
+    """Reporting dates from ``start`` to ``stop`` (inclusive) as datetime64[D].
+
+    ``step`` is one of ``REFERENCE_STEPS``; ``every`` takes every n-th of
+    them, e.g. ``step='month_end', every=3`` for quarter ends.
+    """
+    if step not in REFERENCE_STEPS:
+        raise ValueError(f"step must be one of {REFERENCE_STEPS}, not {step!r}")
+    start = np.datetime64(start, 'D')
+    stop = np.datetime64(stop, 'D')
+    if step == 'day':
+        return np.arange(start, stop + 1, every, dtype='datetime64[D]')
+    unit = 'M' if step.startswith('month') else 'Y'
+    periods = np.arange(start.astype(f'datetime64[{unit}]'),
+                        stop.astype(f'datetime64[{unit}]') + 1, every)
+    if step.endswith('_end'):
+        dates = (periods + 1).astype('datetime64[D]') - 1
+    else:
+        dates = periods.astype('datetime64[D]')
+    return dates[(dates >= start) & (dates <= stop)]
+
+
+def as_of(when):
+    """Reference times as datetime64[s]; plain dates mean the end of that day"""
+    when = np.asarray(when)
+    if when.dtype == 'datetime64[D]' or (when.dtype == object and when.size and all(
+            isinstance(v, datetime.date) and not isinstance(v, datetime.datetime)
+            for v in when.ravel())):
+        return (when.astype('datetime64[D]') + 1).astype('datetime64[s]') - 1
+    return to_datetime64(when)
+
+
+def ages_at(birth, when, feb29='mar1'):
+    """Ages of every birth at every reference time, as one ``AgeBatch``.
+
+    The result has shape ``birth.shape + when.shape``: a scalar birth
+    gives a time series, a scalar ``when`` gives a roster snapshot.  Dates
+    without a time (``datetime64[D]`` such as ``reference_dates`` output,
+    or ``datetime.date``) are taken at the end of the day, so an age on a
+    birthday already counts that birthday.
+    """
+    birth = to_datetime64(birth)
+    when = as_of(when)
+    return compute_ages(birth.reshape(birth.shape + (1,) * when.ndim), when, feb29)
+
+
+def _zone_groups(birth_zones, ref_zones, rows):
+    """Yield (birth_zone, ref_zone, row indices) for each distinct zone pair"""
+    columns = []
+    for zones in (birth_zones, ref_zones):
+        if zones is None or isinstance(zones, str):
+            columns.append((np.array([zones], dtype=object), np.zeros(rows, dtype=np.int64)))
+        else:
+            columns.append(np.unique(np.asarray(zones), return_inverse=True))
+    (birth_names, birth_codes), (ref_names, ref_codes) = columns
+    pairs, inverse = np.unique(birth_codes * len(ref_names) + ref_codes, return_inverse=True)
+    for index, pair in enumerate(pairs.tolist()):
+        birth_name, ref_name = birth_names[pair // len(ref_names)], ref_names[pair % len(ref_names)]
+        # Blank names mean UTC, like None
+        yield (str(birth_name) if birth_name else None, str(ref_name) if ref_name else None,
+               np.flatnonzero(inverse == index))
+
+
+def zoned_ages_at(birth, birth_zones, when, ref_zones=None, feb29='mar1'):
+    """``ages_at`` for a 1-D array of births with zones.
+
+    ``when`` holds wall times (or dates) in each row's reference zone,
+    and zones are one name or one per birth, as in ``compute_zoned_ages``.
+    Returns an ``AgeBatch`` of shape (births, reference times).
+    """
+    birth = to_datetime64(birth).ravel()
+    when = as_of(when).ravel()
+    data = np.empty((len(birth), len(when)), dtype=AGE_DTYPE)
+    # Rows sharing both zones need just one conversion of the reference times
+    for birth_zone, ref_zone, rows in _zone_groups(birth_zones, ref_zones, len(birth)):
+        when_utc = timezones.to_utc(when, ref_zone)
+        ages = compute_zoned_ages(np.repeat(birth[rows], len(when)), birth_zone,
+                                  np.tile(when_utc, len(rows)), ref_zone, feb29)
+        data[rows] = ages.data.reshape(len(rows), len(when))
+    return AgeBatch(data)
+
+
+def next_birthdays(birth, now=None, feb29='mar1'):
+    """Return (next_birthday, days_to_birthday) arrays for ``birth``.
+
+    The birthday for the current year counts if it is today, so a birthday
+    today gives 0 days.  February 29th birthdays are observed on March 1st
+    in non-leap years, or on February 28th with ``feb29='feb28'``.
+    """
+    birth = to_days(to_datetime64(birth))
+    today = to_days(reference_time(now))
+    next_birthday = calendar_tables.next_birthday(birth, today, feb29)
+    return next_birthday.astype('datetime64[D]'), next_birthday - today
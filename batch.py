@@ -0,0 +1,508 @@
+"""Streaming bulk age calculation for CSV and JSONL rosters.
+
+Input rows are read in fixed-size chunks, converted to a datetime64 array
+and pushed through ``age_engine`` in one go, so memory use depends on the
+chunk size rather than on the size of the file.
+
+CSV input needs a ``birth`` column (an optional ``id`` column is copied to
+the output); a file without a header is read as ``birth`` or ``id,birth``.
+JSONL input needs a ``birth`` key per line.  Optional ``birth_tz`` and
+``tz`` columns/keys name the zone of the birth time and the zone the age
+is reported in (IANA names, see ``timezones``).  The output format follows the
+output file extension: ``.jsonl`` writes JSON lines, anything else CSV.
+Binary ``.agerec`` rosters (see ``records``) are read through a memory map.
+"""
+import csv
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import records
+import timezones
+from age_engine import (ages_at, as_of, compute_ages, compute_zoned_ages, next_birthdays,
+                        zoned_ages_at)
+from calendar_tables import DEFAULT_YEAR_RANGE, out_of_range
+
+DEFAULT_CHUNK_SIZE = 65536
+# Output rows (people x reference times) computed at once in --at mode
+AT_CHUNK_CELLS = 1 << 18
+
+OUTPUT_FIELDS = ('id', 'birth', 'years', 'months', 'days',
+                 'hours', 'minutes', 'seconds', 'days_to_birthday')
+# One row per person and reference time in --at mode
+AT_FIELDS = ('id', 'birth', 'at', 'years', 'months', 'days', 'hours', 'minutes', 'seconds')
+
+
+class CsvColumns(NamedTuple):
+    id: int = None
+    birth: int = 0
+    birth_tz: int = None
+    tz: int = None
+
+
+class Zones(NamedTuple):
+    # Per-row zone names; '' means "use the run's default"
+    birth_tz: list
+    tz: list
+
+
+def is_jsonl(path):
+    return os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson')
+
+
+def parse_births(values, lines):
+    """Parse ISO birth strings into datetime64[s], naming the bad line on error"""
+    try:
+        births = np.array(values, dtype='datetime64[s]')
+    except ValueError:
+        for line, value in zip(lines, values):
+            try:
+                np.datetime64(value, 's')
+            except ValueError:
+                raise ValueError(
+                    f"line {line}: invalid birth datetime {value!r}"
+                ) from None
+        raise
+    outside = np.flatnonzero(out_of_range(births))
+    if len(outside):
+        first, last = DEFAULT_YEAR_RANGE
+        index = int(outside[0])
+        raise ValueError(f"line {lines[index]}: birth {values[index]!r} is outside "
+                         f"the years {first}-{last}")
+    return births
+
+
+def csv_columns(header):
+    """Return (CsvColumns, has_header) for a CSV first row"""
+    names = [name.strip().lower() for name in header]
+    if 'birth' in names:
+        def find(name):
+            return names.index(name) if name in names else None
+        return CsvColumns(find('id'), names.index('birth'), find('birth_tz'), find('tz')), True
+    # No header: "birth" or "id,birth"
+    if len(names) == 1:
+        return CsvColumns(), False
+    return CsvColumns(0, 1), False
+
+
+def _row_zones(rows, columns):
+    if columns.birth_tz is None and columns.tz is None:
+        return None
+    def column(index):
+        if index is None:
+            return [''] * len(rows)
+        return [row[index].strip() if index < len(row) else '' for row in rows]
+    return Zones(column(columns.birth_tz), column(columns.tz))
+
+
+def _csv_chunks(lines, chunk_size, columns=None, first_line=1):
+    reader = csv.reader(lines)
+    line = first_line
+    pending = []
+    if columns is None:
+        header = next(reader, None)
+        if header is None:
+            return
+        columns, has_header = csv_columns(header)
+        if has_header:
+            line += 1
+        else:
+            pending = [header]
+    while True:
+        raw = pending + list(islice(reader, chunk_size - len(pending)))
+        pending = []
+        if not raw:
+            return
+        numbered = [(line + i, row) for i, row in enumerate(raw) if row]
+        line += len(raw)
+        if not numbered:
+            continue
+        line_numbers = [number for number, _ in numbered]
+        rows = [row for _, row in numbered]
+        births = [row[columns.birth] for row in rows]
+        if columns.id is None:
+            ids = [str(number) for number in line_numbers]
+        else:
+            ids = [row[columns.id] for row in rows]
+        yield ids, parse_births(births, line_numbers), _row_zones(rows, columns)
+
+
+def _jsonl_chunks(lines, chunk_size, first_line=1):
+    line = first_line
+    while True:
+        raw = list(islice(lines, chunk_size))
+        if not raw:
+            return
+        numbered = [(line + i, json.loads(text)) for i, text in enumerate(raw) if text.strip()]
+        line += len(raw)
+        if not numbered:
+            continue
+        line_numbers = [number for number, _ in numbered]
+        ids = [str(rec.get('id', number)) for number, rec in numbered]
+        zones = None
+        if any('birth_tz' in rec or 'tz' in rec for _, rec in numbered):
+            zones = Zones([rec.get('birth_tz') or '' for _, rec in numbered],
+                          [rec.get('tz') or '' for _, rec in numbered])
+        yield ids, parse_births([rec['birth'] for _, rec in numbered], line_numbers), zones
+
+
+def iter_chunks(lines, chunk_size=DEFAULT_CHUNK_SIZE, jsonl=False, columns=None, first_line=1):
+    """Yield (ids, births, zones) chunks of at most ``chunk_size`` rows.
+
+    ``zones`` is a ``Zones`` pair of per-row zone names, or None when the
+    input has no zone columns.  ``lines`` is any iterable of text lines,
+    usually an open file.  For CSV input the first line is read as a header
+    unless ``columns`` is already known as ``CsvColumns``.  ``first_line`` is the line
+    number of the first line, used for default ids and error messages.
+    """
+    if jsonl:
+        return _jsonl_chunks(iter(lines), chunk_size, first_line)
+    return _csv_chunks(lines, chunk_size, columns, first_line)
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (ids, births, zones) chunks from a CSV, JSONL or ``.agerec`` file"""
+    if records.is_records(path):
+        yield from records.iter_chunks(records.open_records(path), chunk_size)
+        return
+    with open(path, newline='', encoding='utf-8') as src:
+        yield from iter_chunks(src, chunk_size, is_jsonl(path))
+
+
+def reference_time_utc(now):
+    """``now`` as a naive UTC datetime64; naive values are taken as local time"""
+    if now is None:
+        return timezones.utc_now()
+    if isinstance(now, datetime.datetime):
+        now = now.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return np.datetime64(now, 's')
+
+
+def _zone_column(values, default):
+    """Per-row zone names with blanks filled from ``default`` (a name or per-row names)"""
+    if values is None:
+        return default
+    values = np.array(values, dtype=object)
+    blank = values == ''
+    if default is not None:
+        values[blank] = default if isinstance(default, str) else np.asarray(default)[blank]
+    return values.astype(str)
+
+
+def resolve_zones(zones, birth_tz=None, tz=None):
+    """Return (birth_zones, ref_zones) for a chunk, or None if it has no zones"""
+    if zones is None and birth_tz is None and tz is None:
+        return None
+    ref_zones = _zone_column(zones and zones.tz, tz)
+    # Births without a zone are taken to be in the zone the age is reported in
+    birth_zones = _zone_column(zones and zones.birth_tz, birth_tz or ref_zones)
+    return birth_zones, ref_zones
+
+
+def load_roster(path):
+    """Read all ids and births of a roster into memory as (ids, births)"""
+    ids, births = [], []
+    for chunk_ids, chunk_births, _ in read_chunks(path):
+        ids.extend(np.asarray(chunk_ids).tolist())
+        births.append(np.asarray(chunk_births))
+    if not births:
+        return [], np.empty(0, dtype='datetime64[s]')
+    return ids, np.concatenate(births)
+
+
+def process_chunk(ids, births, now, zones=None, birth_tz=None, tz=None, cache=None):
+    """Return the output rows for one chunk as a list of tuples.
+
+    Without any zone information ``births`` and ``now`` are naive wall
+    times in the same zone.  Otherwise births are local to their
+    ``birth_tz`` and ages are reported in ``tz``, with ``now`` converted to
+    UTC first; ``birth_tz``/``tz`` are the defaults for rows without one.
+    Missing zones are UTC, and a missing birth zone is the reference zone.
+    With a ``day_cache.DayCache`` only the sub-day part is computed per row.
+    """
+    resolved = resolve_zones(zones, birth_tz, tz)
+    if resolved is None:
+        if cache is not None:
+            ages, days_to_birthday = cache.ages(births, now)
+        else:
+            ages = compute_ages(births, now)
+            _, days_to_birthday = next_birthdays(births, now)
+    else:
+        birth_zones, ref_zones = resolved
+        now_utc = reference_time_utc(now)
+        if cache is not None:
+            ages, days_to_birthday = cache.zoned_ages(births, birth_zones, now_utc, ref_zones)
+        else:
+            ages = compute_zoned_ages(births, birth_zones, now_utc, ref_zones)
+            # Birthdays fall on the birth's calendar date, counted from "today" in the reference zone
+            today = timezones.from_utc(np.broadcast_to(now_utc, births.shape), ref_zones)
+            _, days_to_birthday = next_birthdays(births, today)
+    columns = [births.astype(str).tolist()]
+    columns += [column.tolist() for column in ages.columns()]
+    columns.append(days_to_birthday.tolist())
+    if isinstance(ids, np.ndarray):
+        ids = ids.tolist()
+    return list(zip(ids, *columns))
+
+
+def parse_reference(text):
+    """One ``--at`` value as datetime64[s]; a bare date means the end of that day"""
+    return as_of(np.datetime64(text))[()]
+
+
+def process_at_chunk(ids, births, when, zones=None, birth_tz=None, tz=None):
+    """Return ``AT_FIELDS`` rows for every birth at every time in ``when``.
+
+    ``when`` is an array of reference times (dates mean the end of the
+    day, see ``age_engine.ages_at``), as wall times in each row's ``tz``
+    when the chunk has zones.  Rows are grouped by person.  A time before
+    the person's birth has no age: its age fields are ``None``, which is an
+    empty CSV field or ``null`` in JSON lines.
+    """
+    when = as_of(when)
+    resolved = resolve_zones(zones, birth_tz, tz)
+    if resolved is None:
+        ages = ages_at(births, when)
+    else:
+        birth_zones, ref_zones = resolved
+        ages = zoned_ages_at(births, birth_zones, when, ref_zones)
+    repeats = len(when)
+    columns = [np.repeat(births.astype(str), repeats).tolist(),
+               np.tile(when.astype(str), len(births)).tolist()]
+    # Years are only negative when the birth is after the reference time
+    unborn = ages.years.ravel() < 0
+    if unborn.any():
+        columns += [np.where(unborn, None, column.ravel().astype(object)).tolist()
+                    for column in ages.columns()]
+    else:
+        columns += [column.ravel().tolist() for column in ages.columns()]
+    return list(zip(np.repeat(np.asarray(ids), repeats).tolist(), *columns))
+
+
+def _process(ids, births, now, zones, birth_tz, tz, at, cache=None):
+    """Yield lists of output rows for one input chunk"""
+    if at is None:
+        yield process_chunk(ids, births, now, zones, birth_tz, tz, cache)
+        return
+    # Every person becomes len(at) rows, so split the chunk to keep memory flat
+    step = max(1, AT_CHUNK_CELLS // max(len(at), 1))
+    for start in range(0, len(births), step):
+        part = slice(start, start + step)
+        part_zones = zones and Zones(zones.birth_tz[part], zones.tz[part])
+        yield process_at_chunk(ids[part], births[part], at, part_zones, birth_tz, tz)
+
+
+class _CsvOutput:
+    def __init__(self, handle, header=True, fields=OUTPUT_FIELDS):
+        self.writer = csv.writer(handle, lineterminator='\n')
+        if header:
+            self.writer.writerow(fields)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+
+class _JsonlOutput:
+    def __init__(self, handle, header=True, fields=OUTPUT_FIELDS):
+        self.handle = handle
+        self.fields = fields
+
+    def write(self, rows):
+        self.handle.writelines(
+            json.dumps(dict(zip(self.fields, row))) + '\n' for row in rows
+        )
+
+
+def _fields(at):
+    return OUTPUT_FIELDS if at is None else AT_FIELDS
+
+
+def open_output(handle, jsonl=False, header=True, fields=OUTPUT_FIELDS):
+    return (_JsonlOutput if jsonl else _CsvOutput)(handle, header, fields)
+
+
+def run_batch(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, now=None,
+              birth_tz=None, tz=None, at=None, cache=None):
+    """Stream ``input_path`` through the age engine into ``output_path``.
+
+    All rows are measured against the same reference time, taken once when
+    the run starts unless ``now`` is given.  ``birth_tz`` and ``tz`` are
+    the zones for rows that don't name their own.  With ``at``, an array
+    of reference times, the output instead has one ``AT_FIELDS`` row per
+    person and time.  ``cache`` is an optional ``day_cache.DayCache`` for
+    the day-level results (not used with ``at``).  Returns the number of
+    input rows.
+    """
+    if now is None:
+        now = datetime.datetime.now()
+    count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as dst:
+        output = open_output(dst, is_jsonl(output_path), fields=_fields(at))
+        for ids, births, zones in read_chunks(input_path, chunk_size):
+            for rows in _process(ids, births, now, zones, birth_tz, tz, at, cache):
+                output.write(rows)
+            count += len(ids)
+    return count
+
+
+def shard_offsets(path, shards, start=0):
+    """Split ``path`` from byte ``start`` into up to ``shards`` line-aligned ranges.
+
+    Every boundary is moved forward to the start of the next line, so a
+    range never begins or ends inside a row.  Rows must not contain quoted
+    newlines.
+    """
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as handle:
+        for k in range(1, shards):
+            target = start + (size - start) * k // shards
+            if target <= bounds[-1]:
+                continue
+            handle.seek(target - 1)
+            handle.readline()
+            offset = handle.tell()
+            if bounds[-1] < offset < size:
+                bounds.append(offset)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _range_lines(path, start, end):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        position = start
+        while position < end:
+            line = handle.readline()
+            if not line:
+                return
+            position += len(line)
+            yield line.decode('utf-8')
+
+
+def _count_lines(path, start, end, block_size=1 << 20):
+    count = 0
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = handle.read(min(block_size, remaining))
+            if not block:
+                break
+            count += block.count(b'\n')
+            remaining -= len(block)
+    return count
+
+
+def shard_chunks(path, shard, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (ids, births, zones) chunks of one ``Shard`` of ``path``"""
+    if records.is_records(path):
+        # Binary shards are record index ranges rather than byte ranges
+        return records.iter_chunks(records.open_records(path), chunk_size,
+                                   shard.start, shard.end)
+    lines = _range_lines(path, shard.start, shard.end)
+    return iter_chunks(lines, chunk_size, is_jsonl(path), shard.columns, shard.first_line)
+
+
+def _run_shard(path, shard, part_path, chunk_size, now, jsonl_out, birth_tz=None, tz=None,
+               at=None, cache=None):
+    """Write one shard's rows; returns (rows, the shard cache's counts or None)"""
+    count = 0
+    with open(part_path, 'w', newline='', encoding='utf-8') as dst:
+        output = open_output(dst, jsonl_out, header=False, fields=_fields(at))
+        for ids, births, zones in shard_chunks(path, shard, chunk_size):
+            for rows in _process(ids, births, now, zones, birth_tz, tz, at, cache):
+                output.write(rows)
+            count += len(ids)
+    if cache is None:
+        return count, None
+    cache.close()
+    return count, cache.counts()
+
+
+def _data_start(path, jsonl):
+    """Return (byte offset of the first data row, csv columns, its line number)"""
+    if jsonl:
+        return 0, None, 1
+    with open(path, 'rb') as handle:
+        first = handle.readline()
+    header = next(csv.reader([first.decode('utf-8')]), None)
+    if header is None:
+        return 0, CsvColumns(), 1
+    columns, has_header = csv_columns(header)
+    if has_header:
+        return len(first), columns, 2
+    return 0, columns, 1
+
+
+class Shard(NamedTuple):
+    start: int
+    end: int
+    columns: Optional[CsvColumns]
+    first_line: int
+
+
+def plan_shards(path, shards, pool):
+    """Cut ``path`` into up to ``shards`` ``Shard`` ranges.
+
+    Text input is split into line-aligned byte ranges, and the lines before
+    each one are counted on ``pool`` so ids and error messages keep the
+    file's line numbers; ``.agerec`` input is split by record index.
+    """
+    if records.is_records(path):
+        total = len(records.open_records(path))
+        bounds = sorted({total * k // shards for k in range(shards + 1)})
+        return [Shard(a, b, None, 1) for a, b in zip(bounds[:-1], bounds[1:])]
+    start, columns, first_line = _data_start(path, is_jsonl(path))
+    ranges = shard_offsets(path, shards, start)
+    line_counts = list(pool.map(_count_lines, repeat(path),
+                                [a for a, _ in ranges], [b for _, b in ranges]))
+    return [Shard(a, b, columns, first_line + sum(line_counts[:i]))
+            for i, (a, b) in enumerate(ranges)]
+
+
+def run_sharded(input_path, output_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, now=None,
+                birth_tz=None, tz=None, at=None, cache=None):
+    """Like ``run_batch`` but spread over ``workers`` processes.
+
+    The input is cut into line-aligned byte ranges, each worker streams its
+    range into its own part file, and the parts are concatenated in input
+    order.  Workers open their own copy of ``cache`` (sharing its file) and
+    their hit counts are added to it.  Returns the number of rows.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return run_batch(input_path, output_path, chunk_size, now, birth_tz, tz, at, cache)
+    if now is None:
+        now = datetime.datetime.now()
+    jsonl_out = is_jsonl(output_path)
+    part_dir = tempfile.mkdtemp(prefix='age-shards-',
+                                dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = plan_shards(input_path, workers, pool)
+            parts = [os.path.join(part_dir, f'part-{i:04d}') for i in range(len(shards))]
+            results = list(pool.map(
+                _run_shard, repeat(input_path), shards, parts, repeat(chunk_size),
+                repeat(now), repeat(jsonl_out), repeat(birth_tz), repeat(tz), repeat(at),
+                repeat(cache),
+            ))
+        with open(output_path, 'w', newline='', encoding='utf-8') as dst:
+            open_output(dst, jsonl_out, fields=_fields(at))
+        with open(output_path, 'ab') as dst:
+            for part in parts:
+                with open(part, 'rb') as src:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+    for _, cache_counts in results:
+        if cache_counts is not None:
+            cache.add_counts(cache_counts)
+    return sum(count for count, _ in results)
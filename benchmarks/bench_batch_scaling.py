@@ -0,0 +1,56 @@
+"""Measure --batch throughput for 1..N worker processes.
+
+    python benchmarks/bench_batch_scaling.py --rows 2000000 --max-workers 8
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch
+
+
+def write_roster(path, rows, seed=0):
+    rng = random.Random(seed)
+    start = datetime.datetime(1920, 1, 1)
+    span = 100 * 365 * 86400
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write('id,birth\n')
+        for i in range(rows):
+            birth = start + datetime.timedelta(seconds=rng.randrange(span))
+            handle.write(f"{i},{birth.isoformat(sep=' ')}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=batch.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    now = datetime.datetime(2025, 1, 1, 12, 0, 0)
+    with tempfile.TemporaryDirectory() as tmp:
+        roster = os.path.join(tmp, 'roster.csv')
+        write_roster(roster, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(roster) / 1e6:.1f} MB, "
+              f"{os.cpu_count()} CPUs")
+        print(f"{'workers':>7} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            output = os.path.join(tmp, f'out-{workers}.csv')
+            start = time.perf_counter()
+            batch.run_sharded(roster, output, workers, args.chunk_size, now)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} "
+                  f"{baseline / elapsed:>7.2f}x")
+            os.remove(output)
+
+
+if __name__ == '__main__':
+    main()
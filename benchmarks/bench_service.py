@@ -0,0 +1,101 @@
+"""Load-test the local age service over keep-alive connections on localhost.
+
+The server runs in a child process; each client connection sends /age
+queries back to back.  Runs once with request batching and once with
+batches of one for comparison.
+
+    python benchmarks/bench_service.py --connections 64 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER = r"""
+import sys
+import service
+service.run('127.0.0.1', 0, max_batch=int(sys.argv[1]))
+"""
+
+
+async def read_response(reader):
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    if b' 200 ' not in status:
+        raise RuntimeError(f"{status!r}: {body!r}")
+    return body
+
+
+async def client(port, requests, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for _ in range(requests):
+        birth = f"{rng.randrange(1930, 2020)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}T08:30:00"
+        start = time.perf_counter()
+        writer.write(f"GET /age?birth={birth} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await read_response(reader)
+        latencies.append((time.perf_counter() - start) * 1000)
+    writer.close()
+
+
+async def fetch_stats(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b"GET /stats HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    stats = json.loads(await read_response(reader))
+    writer.close()
+    return stats
+
+
+async def load(port, connections, requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, latencies, seed)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, latencies, await fetch_stats(port)
+
+
+def measure(max_batch, connections, requests):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    server = subprocess.Popen([sys.executable, '-c', SERVER, str(max_batch)], env=env,
+                              cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(':', 1)[1])
+        return asyncio.run(load(port, connections, requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=200,
+                        help="requests per connection")
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>11}")
+    for name, max_batch in (('batched', 512), ('unbatched', 1)):
+        rate, latencies, stats = measure(max_batch, args.connections, args.requests)
+        cuts = statistics.quantiles(latencies, n=100)
+        print(f"{name:>10} {rate:>9.0f} {cuts[49]:>8.2f} {cuts[98]:>8.2f} "
+              f"{stats['batching']['mean_batch']:>11}")
+
+
+if __name__ == '__main__':
+    main()
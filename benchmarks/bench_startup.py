@@ -0,0 +1,82 @@
+"""Measure cold start (import -> first painted frame) under the offscreen platform.
+
+Each run is a fresh interpreter that starts the GUI through ``main``, so
+the import cost of the entry point counts too; "numpy" tells whether NumPy
+was loaded before the first frame.  "lazy" is the normal startup; "eager"
+builds every page before showing the window, like the app used to.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from PyQt6.QtCore import QEvent, QObject
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not hasattr(self, 'at'):
+            self.at = time.perf_counter()
+            self.numpy = 'numpy' in sys.modules
+            app.quit()
+        return False
+
+app, window = main.create_window(main.parse_args(['--no-warm-up']))
+if sys.argv[1] == 'eager':
+    from gui import PAGE_PICKER, PAGE_RESULT, PAGE_DASHBOARD
+    for page in (PAGE_PICKER, PAGE_RESULT, PAGE_DASHBOARD):
+        window.ensure_page(page)
+constructed = time.perf_counter()
+watcher = FirstPaint()
+window.installEventFilter(watcher)
+window.show()
+app.exec()
+print(json.dumps({
+    'import': imported - start,
+    'construct': constructed - imported,
+    'first_frame': watcher.at - start,
+    'numpy': watcher.numpy,
+}))
+"""
+
+
+def run_once(mode):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, '-c', CHILD, mode], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(mode, runs):
+    samples = [run_once(mode) for _ in range(runs)]
+    result = {key: statistics.median(s[key] for s in samples)
+              for key in ('import', 'construct', 'first_frame')}
+    result['numpy'] = any(s['numpy'] for s in samples)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'import ms':>10} {'construct ms':>13} {'first frame ms':>15} {'numpy':>6}")
+    for mode in ('lazy', 'eager'):
+        result = measure(mode, args.runs)
+        print(f"{mode:>6} {result['import'] * 1000:>10.1f} "
+              f"{result['construct'] * 1000:>13.1f} {result['first_frame'] * 1000:>15.1f} "
+              f"{'yes' if result['numpy'] else 'no':>6}")
+
+
+if __name__ == '__main__':
+    main()
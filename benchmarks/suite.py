@@ -0,0 +1,284 @@
+"""Benchmark suite for computation, rendering and startup.
+
+Runs headless under the offscreen Qt platform and writes every metric to
+a JSON file.  All metrics are times, so lower is better; a run compared
+against a baseline fails when any metric got slower by more than the
+threshold.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline results.json --threshold 0.15
+    python benchmarks/suite.py --compare old.json new.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import numpy as np
+
+import bench_startup
+from age_engine import age_breakdown, compute_ages, next_birthdays
+from day_cache import DayCache
+
+DEFAULT_THRESHOLD = 0.10
+BATCH_ROWS = 1_000_000
+PARTICLE_COUNTS = (50, 200, 400, 1000)
+CONFETTI_FRAMES = 60
+TICKS = 2000
+CARDS = 50
+
+
+def timed(func, repeat):
+    """Median wall time of ``func()`` over ``repeat`` runs, in ms"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_scalar(repeat):
+    birth = datetime.datetime(1990, 5, 17, 8, 30)
+    now = datetime.datetime(2026, 10, 17, 12, 0)
+    calls = 2000
+
+    def run():
+        for _ in range(calls):
+            age_breakdown(birth, now)
+    return {'scalar_age.us_per_call': timed(run, repeat) * 1000 / calls}
+
+
+def bench_batch(repeat):
+    rng = np.random.default_rng(0)
+    births = (np.datetime64('1930-01-01T00:00:00')
+              + rng.integers(0, 90 * 365 * 86400, BATCH_ROWS).astype('timedelta64[s]'))
+    now = np.datetime64('2026-10-17T12:00:00')
+    cache = DayCache()
+    cache.ages(births, now)
+    return {
+        'batch_ages.ms_per_million': timed(lambda: compute_ages(births, now), repeat)
+        * 1_000_000 / BATCH_ROWS,
+        'next_birthdays.ms_per_million': timed(lambda: next_birthdays(births, now), repeat)
+        * 1_000_000 / BATCH_ROWS,
+        # Ages and next birthdays together, day-level parts from a warm cache
+        'cached_ages.ms_per_million': timed(lambda: cache.ages(births, now), repeat)
+        * 1_000_000 / BATCH_ROWS,
+    }
+
+
+def gui_window():
+    from gui import QApplication, AgeCalculator
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = AgeCalculator(warm_up=False)
+    window.resize(900, 800)
+    window.show()
+    app.processEvents()
+    return app, window
+
+
+def bench_tick(repeat):
+    from PyQt6.QtCore import QDate, QTime
+    from gui import PAGE_PICKER
+
+    app, window = gui_window()
+    window.ensure_page(PAGE_PICKER)
+    window.calendar.setSelectedDate(QDate(1990, 5, 17))
+    window.time_edit.setTime(QTime(8, 30, 0))
+    window.calculate_and_show_result()
+    app.processEvents()
+    samples = []
+    for _ in range(TICKS):
+        start = time.perf_counter()
+        window.update_age()
+        samples.append((time.perf_counter() - start) * 1000)
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return {
+        'update_age.median_ms': statistics.median(samples),
+        'update_age.p99_ms': statistics.quantiles(samples, n=100)[98],
+    }
+
+
+def bench_confetti(repeat):
+    from gui import PAGE_RESULT
+
+    app, window = gui_window()
+    window.ensure_page(PAGE_RESULT)
+    window.show_page(PAGE_RESULT)
+    app.processEvents()
+    overlay = window.confetti
+    results = {}
+    for count in PARTICLE_COUNTS:
+        overlay.set_max_particles(count)
+        overlay.burst(count)
+        samples = []
+        for _ in range(CONFETTI_FRAMES):
+            start = time.perf_counter()
+            overlay.advance()
+            overlay.repaint()
+            samples.append((time.perf_counter() - start) * 1000)
+        overlay.clear()
+        results[f'confetti_frame.{count}_particles_ms'] = statistics.median(samples)
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return results
+
+
+def bench_pages(repeat):
+    from gui import PAGE_DASHBOARD, PAGE_PICKER, PAGE_RESULT
+
+    names = {PAGE_PICKER: 'picker', PAGE_RESULT: 'result', PAGE_DASHBOARD: 'dashboard'}
+    samples = {page: [] for page in names}
+    for _ in range(repeat):
+        app, window = gui_window()
+        for page in names:
+            start = time.perf_counter()
+            window.ensure_page(page)
+            samples[page].append((time.perf_counter() - start) * 1000)
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+    return {f'page_build.{names[page]}_ms': statistics.median(values)
+            for page, values in samples.items()}
+
+
+def bench_cards(repeat):
+    from PyQt6.QtGui import QGuiApplication
+
+    import cards
+
+    # Held so the application outlives the rendering below
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+    rng = np.random.default_rng(0)
+    births = (np.datetime64('1930-01-01T00:00:00')
+              + rng.integers(0, 90 * 365 * 86400, CARDS).astype('timedelta64[s]'))
+    data = cards.card_data(np.arange(CARDS), births, datetime.datetime(2026, 10, 17, 12, 0))
+    template = cards.CardTemplate()
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for fmt in cards.CARD_FORMATS:
+            paths = [os.path.join(folder, cards.card_filename(card.person_id, fmt))
+                     for card in data]
+
+            def run():
+                for card, path in zip(data, paths):
+                    template.render(card, path, fmt)
+            results[f'card_render.{fmt}_ms'] = timed(run, repeat) / CARDS
+    return results
+
+
+def bench_cold_start(repeat):
+    result = bench_startup.measure('lazy', repeat)
+    return {
+        'cold_start.import_ms': result['import'] * 1000,
+        'cold_start.first_frame_ms': result['first_frame'] * 1000,
+    }
+
+
+BENCHMARKS = {
+    'scalar': bench_scalar,
+    'batch': bench_batch,
+    'tick': bench_tick,
+    'confetti': bench_confetti,
+    'pages': bench_pages,
+    'cards': bench_cards,
+    'cold_start': bench_cold_start,
+}
+
+
+def environment():
+    from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'qpa': os.environ.get('QT_QPA_PLATFORM'),
+    }
+
+
+def run(names, repeat):
+    metrics = {}
+    for name in names:
+        start = time.perf_counter()
+        metrics.update(BENCHMARKS[name](repeat))
+        print(f"  {name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return {'environment': environment(), 'metrics': metrics}
+
+
+def compare(baseline, current, threshold):
+    """Print a comparison table and return the names of regressed metrics"""
+    regressions = []
+    print(f"{'metric':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, value in current['metrics'].items():
+        old = baseline['metrics'].get(name)
+        if old is None or old <= 0:
+            print(f"{name:<40} {'-':>10} {value:>10.3f}")
+            continue
+        change = value / old - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<40} {old:>10.3f} {value:>10.3f} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def load(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', metavar='JSON', help="write results here")
+    parser.add_argument('--baseline', metavar='JSON', help="compare the run against these results")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two saved runs without running anything")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a metric fails (0.10 = 10%%)")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="run only these benchmarks")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, current = load(args.compare[0]), load(args.compare[1])
+    else:
+        baseline = load(args.baseline) if args.baseline else None
+        current = run(args.only, args.repeat)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as handle:
+                json.dump(current, handle, indent=2)
+        if baseline is None:
+            for name, value in current['metrics'].items():
+                print(f"{name:<40} {value:>10.3f}")
+            return 0
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) slower than the {args.threshold:.0%} threshold: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
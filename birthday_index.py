@@ -0,0 +1,129 @@
+"""Sorted index of birthdays for "who has a birthday soon" queries.
+
+Every person is filed under the day of the year their birthday falls on in
+a leap-year calendar (January 1st is 0, February 29th is 59, December 31st
+is 365).  The keys are kept in one sorted list with the ids sorted inside
+each day, so a date window maps to one or two contiguous key ranges that
+are found with a binary search, and inserts and removals are a bisect plus
+a list insert.
+
+In non-leap years February 29th birthdays are observed on March 1st by
+default, the same roll-over ``age_engine.next_birthdays`` uses; pass
+``feb29='feb28'`` to observe them on February 28th instead.
+"""
+import calendar
+import datetime
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+import records
+from age_engine import split_date, to_datetime64
+from calendar_tables import CUMULATIVE_DAYS, check_policy
+
+# Days before each month in a leap year
+_LEAP_MONTH_START = tuple(CUMULATIVE_DAYS[1, :12].tolist())
+FEB28, FEB29, MAR1 = 58, 59, 60
+
+
+def birthday_key(month, day):
+    """Leap-calendar day of year (0-365) for a month and day"""
+    return _LEAP_MONTH_START[month - 1] + day - 1
+
+
+def birthday_keys(births):
+    """Vectorised ``birthday_key`` for an array of birth datetimes"""
+    _, month, day = split_date(to_datetime64(births))
+    return np.asarray(_LEAP_MONTH_START)[month - 1] + day - 1
+
+
+def key_to_date(key, year, feb29='mar1'):
+    """The date a birthday key is observed on in ``year``"""
+    if not calendar.isleap(year):
+        if key == FEB29:
+            return datetime.date(year, 3, 1) if feb29 == 'mar1' else datetime.date(year, 2, 28)
+        if key > FEB29:
+            key -= 1
+    return datetime.date(year, 1, 1) + datetime.timedelta(days=key)
+
+
+class BirthdayIndex:
+    def __init__(self, feb29='mar1'):
+        check_policy(feb29)
+        self.feb29 = feb29
+        self.keys = []
+        self.ids = []
+
+    @classmethod
+    def from_births(cls, ids, births, feb29='mar1'):
+        """Build an index in one sort from parallel id and birth sequences"""
+        index = cls(feb29)
+        ids = np.asarray(ids)
+        keys = birthday_keys(births)
+        order = np.lexsort((ids, keys))
+        index.keys = keys[order].tolist()
+        index.ids = ids[order].tolist()
+        return index
+
+    @classmethod
+    def from_records(cls, recs, feb29='mar1'):
+        """Build an index from a ``records.open_records`` array"""
+        return cls.from_births(recs['id'], records.birth_datetimes(recs), feb29)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _day_range(self, key):
+        lo = bisect_left(self.keys, key)
+        return lo, bisect_right(self.keys, key, lo)
+
+    def insert(self, person_id, birth):
+        key = birthday_key(birth.month, birth.day)
+        lo, hi = self._day_range(key)
+        pos = bisect_left(self.ids, person_id, lo, hi)
+        self.keys.insert(pos, key)
+        self.ids.insert(pos, person_id)
+
+    def remove(self, person_id, birth):
+        """Remove ``person_id``; raises KeyError if it is not filed under ``birth``"""
+        key = birthday_key(birth.month, birth.day)
+        lo, hi = self._day_range(key)
+        pos = bisect_left(self.ids, person_id, lo, hi)
+        if pos == hi or self.ids[pos] != person_id:
+            raise KeyError(person_id)
+        del self.keys[pos]
+        del self.ids[pos]
+
+    def _key_span(self, start, end):
+        """Key range [lo, hi] covering the dates start..end within one year"""
+        lo = birthday_key(start.month, start.day)
+        hi = birthday_key(end.month, end.day)
+        if not calendar.isleap(start.year):
+            if self.feb29 == 'feb28' and hi == FEB28:
+                hi = FEB29
+            elif self.feb29 == 'mar1' and lo == MAR1:
+                lo = FEB29
+        return lo, hi
+
+    def upcoming(self, today, days):
+        """Return [(date, id)] for birthdays from ``today`` up to ``today + days`` (exclusive)"""
+        result = []
+        end = today + datetime.timedelta(days=days - 1)
+        start = today
+        while start <= end:
+            year_end = min(end, datetime.date(start.year, 12, 31))
+            lo_key, hi_key = self._key_span(start, year_end)
+            lo = bisect_left(self.keys, lo_key)
+            hi = bisect_right(self.keys, hi_key, lo)
+            dates = {}
+            for key, person_id in zip(self.keys[lo:hi], self.ids[lo:hi]):
+                date = dates.get(key)
+                if date is None:
+                    date = dates[key] = key_to_date(key, start.year, self.feb29)
+                result.append((date, person_id))
+            start = year_end + datetime.timedelta(days=1)
+        return result
+
+    def on_date(self, date):
+        """Ids with a birthday observed on ``date``"""
+        return [person_id for _, person_id in self.upcoming(date, 1)]
@@ -0,0 +1,200 @@
+"""Calendar arithmetic on precomputed lookup tables.
+
+Leap years and the first day of every month are tabulated once per year
+range (cached), together with the cumulative days before each month, so
+month lengths, month steps and day-of-year are array lookups for any
+number of dates.  Day numbers are int64 days since 1970-01-01, the same
+as ``datetime64[D]``.
+
+Moving a date by whole months can land on a day the target month doesn't
+have: February 29th in a non-leap year, or January 31st plus one month.
+The ``feb29`` policy decides where it goes: ``'mar1'`` rolls over to the
+first day of the next month, ``'feb28'`` stays on the last day of the
+month.
+"""
+import calendar
+import datetime
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+# The years datetime.date can represent
+DEFAULT_YEAR_RANGE = (1, 9999)
+FEB29_POLICIES = ('mar1', 'feb28')
+
+# [leap][month - 1]
+DAYS_IN_MONTH = np.array([
+    [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+    [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
+], dtype=np.int64)
+# Days before each month, [leap][month - 1]; the last column is the year length
+CUMULATIVE_DAYS = np.concatenate(
+    (np.zeros((2, 1), dtype=np.int64), np.cumsum(DAYS_IN_MONTH, axis=1)), axis=1)
+_MONTH_LENGTHS = DAYS_IN_MONTH.tolist()
+
+
+class CalendarTable(NamedTuple):
+    first_year: int
+    last_year: int
+    # leap[i] for year first_year + i
+    leap: np.ndarray
+    # Day number of the 1st of month i = (year - first_year) * 12 + month - 1,
+    # plus one entry for the day after the last month
+    month_start: np.ndarray
+
+
+def check_policy(feb29):
+    if feb29 not in FEB29_POLICIES:
+        raise ValueError(f"feb29 must be one of {FEB29_POLICIES}, not {feb29!r}")
+
+
+@lru_cache(maxsize=None)
+def calendar_table(years=DEFAULT_YEAR_RANGE):
+    """Build the lookup tables for ``years`` (inclusive)"""
+    first, last = years
+    year = np.arange(first, last + 1)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    lengths = DAYS_IN_MONTH[leap.astype(np.int64)].ravel()
+    start = np.datetime64(f'{first:04d}-01-01', 'D').astype(np.int64)
+    month_start = start + np.concatenate(([0], np.cumsum(lengths)))
+    return CalendarTable(first, last, leap, month_start)
+
+
+def _month_index(year, month, table):
+    index = (np.asarray(year, dtype=np.int64) - table.first_year) * 12 + np.asarray(month) - 1
+    if np.any(index < 0) or np.any(index >= len(table.month_start) - 1):
+        raise ValueError(f"date outside the calendar range "
+                         f"{table.first_year}-{table.last_year}")
+    return index
+
+
+def out_of_range(values, years=DEFAULT_YEAR_RANGE):
+    """Mask of datetime64 values whose date falls outside ``years``"""
+    days = to_days(values)
+    table = calendar_table(years)
+    return (days < table.month_start[0]) | (days >= table.month_start[-1])
+
+
+def is_leap(year, years=DEFAULT_YEAR_RANGE):
+    table = calendar_table(years)
+    return table.leap[_month_index(year, 1, table) // 12]
+
+
+def days_in_month(year, month, years=DEFAULT_YEAR_RANGE):
+    table = calendar_table(years)
+    index = _month_index(year, month, table)
+    return table.month_start[index + 1] - table.month_start[index]
+
+
+def day_of_year(year, month, day, years=DEFAULT_YEAR_RANGE):
+    """1-based day of the year"""
+    leap = is_leap(year, years).astype(np.int64)
+    return CUMULATIVE_DAYS[leap, np.asarray(month) - 1] + day
+
+
+def to_days(values):
+    """Day numbers for datetime64 values (or anything numpy can convert)"""
+    return np.asarray(values, dtype='datetime64[D]').astype(np.int64)
+
+
+def split_days(days, years=DEFAULT_YEAR_RANGE):
+    """Split day numbers into (year, month, day) arrays"""
+    table = calendar_table(years)
+    days = np.asarray(days, dtype=np.int64)
+    index = np.searchsorted(table.month_start, days, 'right') - 1
+    if np.any(index < 0) or np.any(index >= len(table.month_start) - 1):
+        raise ValueError(f"date outside the calendar range "
+                         f"{table.first_year}-{table.last_year}")
+    return table.first_year + index // 12, index % 12 + 1, days - table.month_start[index] + 1
+
+
+def add_months(year, month, day, months, feb29='mar1', years=DEFAULT_YEAR_RANGE):
+    """Day number of year/month/day moved by ``months`` whole months"""
+    table = calendar_table(years)
+    index = _month_index(year, month, table) + months
+    if np.any(index < 0) or np.any(index >= len(table.month_start) - 1):
+        raise ValueError(f"date outside the calendar range "
+                         f"{table.first_year}-{table.last_year}")
+    start = table.month_start[index]
+    length = table.month_start[index + 1] - start
+    if feb29 == 'feb28':
+        return start + np.minimum(day, length) - 1
+    # One past the month's last day is the 1st of the next month
+    return start + np.minimum(day, length + 1) - 1
+
+
+def ymd_difference(birth, now, feb29='mar1', years=DEFAULT_YEAR_RANGE):
+    """Whole years and months from ``birth`` to ``now``, and where they end.
+
+    Returns (years, months, anniversary): ``anniversary`` is ``birth``
+    moved forward by that many months (datetime64[s], same time of day),
+    the latest such point not after ``now``.  ``now - anniversary`` is the
+    remaining days and time, always shorter than the next month step.
+    """
+    check_policy(feb29)
+    birth = np.asarray(birth, dtype='datetime64[s]')
+    now = np.asarray(now, dtype='datetime64[s]')
+    birth_date = birth.astype('datetime64[D]')
+    time_of_day = birth - birth_date
+    birth_year, birth_month, birth_day = split_days(birth_date.astype(np.int64), years)
+    now_year, now_month, _ = split_days(to_days(now), years)
+
+    steps = (now_year - birth_year) * 12 + (now_month - birth_month)
+
+    def anniversary_at(steps):
+        day = add_months(birth_year, birth_month, birth_day, steps, feb29, years)
+        return day.astype('datetime64[D]') + time_of_day
+
+    anniversary = anniversary_at(steps)
+    # The step for the current month may still be ahead (later day or time),
+    # and with 'mar1' the one before it can roll over into this month too
+    early = anniversary > now
+    while np.any(early):
+        steps = steps - early
+        anniversary = np.where(early, anniversary_at(steps), anniversary)
+        early = anniversary > now
+    years_out, months_out = np.divmod(steps, 12)
+    return years_out, months_out, anniversary
+
+
+def shift_date(date, months, feb29='mar1'):
+    """Scalar ``add_months`` for a ``datetime.date``"""
+    year, month = divmod(date.year * 12 + date.month - 1 + months, 12)
+    month += 1
+    length = _MONTH_LENGTHS[calendar.isleap(year)][month - 1]
+    if date.day <= length:
+        return date.replace(year=year, month=month)
+    last = datetime.date(year, month, length)
+    return last if feb29 == 'feb28' else last + datetime.timedelta(days=1)
+
+
+def month_steps(birth, now, feb29='mar1'):
+    """Scalar ``ymd_difference`` for naive datetimes: (whole months, anniversary)"""
+    check_policy(feb29)
+    steps = (now.year - birth.year) * 12 + now.month - birth.month
+    birth_date, birth_time = birth.date(), birth.time()
+    while True:
+        anniversary = datetime.datetime.combine(shift_date(birth_date, steps, feb29), birth_time)
+        if anniversary <= now:
+            return steps, anniversary
+        steps -= 1
+
+
+def birthday_in(year, month, day, feb29='mar1', years=DEFAULT_YEAR_RANGE):
+    """Day number a birthday on month/day is observed on in ``year``"""
+    return add_months(year, month, day, 0, feb29, years)
+
+
+def next_birthday(birth, today, feb29='mar1', years=DEFAULT_YEAR_RANGE):
+    """Day number of the first birthday on or after ``today`` (day numbers)"""
+    check_policy(feb29)
+    _, month, day = split_days(birth, years)
+    today = np.asarray(today, dtype=np.int64)
+    year, _, _ = split_days(today, years)
+    candidate = birthday_in(year, month, day, feb29, years)
+    passed = candidate < today
+    if np.any(passed):
+        candidate = np.where(passed, birthday_in(year + passed, month, day, feb29, years),
+                             candidate)
+    return candidate
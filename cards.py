@@ -0,0 +1,219 @@
+"""Headless rendering of result-page cards to PNG or PDF files.
+
+``CardTemplate`` lays out the result page once: the themed background and
+panel are painted into a base ``QImage``, and the fonts, colors and text
+rectangles are fixed.  A card then only copies the base image and draws
+its own text.  Cards are rendered on a thread pool; every worker thread
+keeps its own canvas, fonts and pens, and PyQt releases the GIL while Qt
+paints and encodes, so the threads run in parallel.
+
+Needs a ``QGuiApplication`` (the ``offscreen`` platform is fine) but no
+windows.
+"""
+import datetime
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from PyQt6.QtCore import QMarginsF, QPointF, QRectF, QSizeF, Qt
+from PyQt6.QtGui import (QColor, QFont, QImage, QLinearGradient, QPageLayout, QPageSize,
+                         QPainter, QPdfWriter)
+
+import batch
+import theme
+import timezones
+from age_engine import (AgeBreakdown, compute_ages, compute_zoned_ages, next_birthdays,
+                        reference_time)
+
+CARD_WIDTH = 900
+CARD_HEIGHT = 520
+PANEL_MARGIN = 40
+CARD_FORMATS = ('png', 'pdf')
+BANNER_TEXT = "🎉 Happy Birthday! 🎂"
+# Cards are opaque; without an alpha channel PNG encoding is about twice as fast
+CANVAS_FORMAT = QImage.Format.Format_RGB32
+
+
+class CardData(NamedTuple):
+    person_id: object
+    age: AgeBreakdown
+    days_to_birthday: int
+    next_birthday: datetime.date
+
+    @property
+    def is_birthday(self):
+        return self.days_to_birthday == 0
+
+
+def _color(value):
+    """QColor for a theme value, including CSS-style ``rgba(r, g, b, a)``"""
+    match = re.fullmatch(r'rgba\((\d+),\s*(\d+),\s*(\d+),\s*([\d.]+)\)', value)
+    if match:
+        r, g, b, alpha = match.groups()
+        return QColor(int(r), int(g), int(b), round(float(alpha) * 255))
+    return QColor(value)
+
+
+def _font(family, points, weight=QFont.Weight.Normal):
+    """Font sized in card pixels, so PNG (96 dpi) and PDF (72 dpi) cards match"""
+    font = QFont(family)
+    font.setPixelSize(round(points * 96 / 72))
+    font.setWeight(weight)
+    return font
+
+
+def card_data(ids, births, now=None, zones=None, birth_tz=None, tz=None):
+    """``CardData`` for one roster chunk, with the zone handling of ``batch``"""
+    resolved = batch.resolve_zones(zones, birth_tz, tz)
+    if resolved is None:
+        today = reference_time(now)
+        ages = compute_ages(births, today)
+    else:
+        birth_zones, ref_zones = resolved
+        now_utc = batch.reference_time_utc(now)
+        ages = compute_zoned_ages(births, birth_zones, now_utc, ref_zones)
+        today = timezones.from_utc(np.broadcast_to(now_utc, births.shape), ref_zones)
+    next_birthday, days_to_birthday = next_birthdays(births, today)
+    if isinstance(ids, np.ndarray):
+        ids = ids.tolist()
+    return [CardData(person_id, age, days, day) for person_id, age, days, day
+            in zip(ids, ages, days_to_birthday.tolist(), next_birthday.tolist())]
+
+
+class _Resources:
+    """Per-thread canvas, fonts and colors, created once per worker"""
+
+    def __init__(self, template):
+        self.canvas = QImage(template.base.size(), CANVAS_FORMAT)
+        self.heading_font = _font('Arial', 20)
+        self.id_font = _font('Segoe UI', 14, QFont.Weight.Bold)
+        self.age_font = _font('Arial', 22, QFont.Weight.Bold)
+        self.birthday_font = _font('Arial', 17)
+        self.banner_font = _font('Arial', 30, QFont.Weight.Bold)
+        self.text = _color(template.colors['text'])
+        self.muted = _color(template.colors['text_muted'])
+        self.celebration = _color(template.colors['celebration'])
+
+
+class CardTemplate:
+    """Result-page layout shared by every card of one theme"""
+
+    def __init__(self, theme_name=theme.DEFAULT_THEME, width=CARD_WIDTH, height=CARD_HEIGHT):
+        self.colors = theme.THEMES[theme_name]
+        self.width, self.height = width, height
+        self.base = self._paint_base()
+        self.local = threading.local()
+
+        panel = QRectF(PANEL_MARGIN, PANEL_MARGIN, width - 2 * PANEL_MARGIN,
+                       height - 2 * PANEL_MARGIN)
+        inner = panel.adjusted(30, 20, -30, -20)
+        row = inner.height() / 8
+        self.id_rect = QRectF(inner.left(), inner.top(), inner.width(), row)
+        self.heading_rect = QRectF(inner.left(), inner.top() + row, inner.width(), row)
+        self.age_rect = QRectF(inner.left(), inner.top() + 2 * row, inner.width(), 2.4 * row)
+        self.birthday_rect = QRectF(inner.left(), inner.top() + 4.6 * row, inner.width(), 1.8 * row)
+        self.banner_rect = QRectF(inner.left(), inner.top() + 6.4 * row, inner.width(), 1.6 * row)
+
+    def _paint_base(self):
+        image = QImage(self.width, self.height, CANVAS_FORMAT)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        gradient = QLinearGradient(QPointF(0, 0), QPointF(self.width, self.height))
+        gradient.setColorAt(0, _color(self.colors['gradient_start']))
+        gradient.setColorAt(0.46, _color(self.colors['gradient_mid']))
+        gradient.setColorAt(1, _color(self.colors['gradient_end']))
+        painter.fillRect(image.rect(), gradient)
+        painter.setPen(_color(self.colors['border']))
+        painter.setBrush(_color(self.colors['surface']))
+        painter.drawRoundedRect(QRectF(PANEL_MARGIN, PANEL_MARGIN, self.width - 2 * PANEL_MARGIN,
+                                       self.height - 2 * PANEL_MARGIN), 15, 15)
+        painter.end()
+        return image
+
+    def resources(self):
+        resources = getattr(self.local, 'resources', None)
+        if resources is None:
+            resources = self.local.resources = _Resources(self)
+        return resources
+
+    def paint(self, painter, card, resources):
+        """Draw ``card``'s text over the base layout"""
+        center = Qt.AlignmentFlag.AlignCenter
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setPen(resources.muted)
+        painter.setFont(resources.id_font)
+        painter.drawText(self.id_rect, center, str(card.person_id))
+        painter.setFont(resources.heading_font)
+        painter.drawText(self.heading_rect, center, "Your age is:")
+        painter.setPen(resources.text)
+        painter.setFont(resources.age_font)
+        painter.drawText(self.age_rect, center, card.age.format())
+        if card.is_birthday:
+            painter.setPen(resources.celebration)
+            painter.setFont(resources.banner_font)
+            painter.drawText(self.banner_rect, center, BANNER_TEXT)
+        else:
+            painter.setFont(resources.birthday_font)
+            painter.drawText(self.birthday_rect, center,
+                             f"Next birthday in: {card.days_to_birthday} days\n"
+                             f"({card.next_birthday.strftime('%B %d, %Y')})")
+
+    def render_png(self, card, path):
+        resources = self.resources()
+        canvas = resources.canvas
+        painter = QPainter(canvas)
+        painter.drawImage(0, 0, self.base)
+        self.paint(painter, card, resources)
+        painter.end()
+        if not canvas.save(path, 'PNG'):
+            raise OSError(f"could not write {path}")
+
+    def render_pdf(self, card, path):
+        resources = self.resources()
+        writer = QPdfWriter(path)
+        writer.setResolution(72)
+        writer.setPageSize(QPageSize(QSizeF(self.width, self.height), QPageSize.Unit.Point))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Unit.Point)
+        painter = QPainter(writer)
+        # The background stays a raster image; the text is vector
+        painter.drawImage(0, 0, self.base)
+        self.paint(painter, card, resources)
+        painter.end()
+
+    def render(self, card, path, fmt='png'):
+        (self.render_pdf if fmt == 'pdf' else self.render_png)(card, path)
+
+
+def card_filename(person_id, fmt):
+    return re.sub(r'[^\w.-]', '_', str(person_id)) + '.' + fmt
+
+
+def render_cards(input_path, output_dir, fmt='png', workers=None, now=None,
+                 chunk_size=batch.DEFAULT_CHUNK_SIZE, theme_name=theme.DEFAULT_THEME,
+                 birth_tz=None, tz=None):
+    """Render one card per roster row into ``output_dir``.
+
+    The roster is streamed in chunks, and each chunk's cards are rendered
+    on ``workers`` threads (default: one per CPU core) before the next is
+    read.  Returns (cards, seconds).
+    """
+    if fmt not in CARD_FORMATS:
+        raise ValueError(f"card format must be one of {CARD_FORMATS}, not {fmt!r}")
+    if now is None:
+        now = datetime.datetime.now()
+    os.makedirs(output_dir, exist_ok=True)
+    template = CardTemplate(theme_name)
+    count = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for ids, births, zones in batch.read_chunks(input_path, chunk_size):
+            cards = card_data(ids, births, now, zones, birth_tz, tz)
+            paths = [os.path.join(output_dir, card_filename(card.person_id, fmt))
+                     for card in cards]
+            for _ in pool.map(template.render, cards, paths, [fmt] * len(cards)):
+                count += 1
+    return count, time.perf_counter() - start
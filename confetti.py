@@ -0,0 +1,127 @@
+"""Pooled confetti particles painted by a single overlay widget.
+
+The overlay keeps a fixed-size pool of particle slots in NumPy arrays and
+paints every live particle with one QPainter pass per frame, driven by one
+animation timer that only runs while particles are in flight.  Launching a
+particle just fills a free slot, so no widgets, stylesheets or animations
+are created per particle.
+"""
+import random
+
+import numpy as np
+from PyQt6.QtCore import QElapsedTimer, QEvent, Qt, QTimer
+from PyQt6.QtGui import QBrush, QColor, QPainter
+from PyQt6.QtWidgets import QWidget
+
+CONFETTI_COLORS = ('#FF4081', '#FF9800', '#FFEB3B', '#4CAF50', '#2196F3', '#9C27B0')
+DEFAULT_MAX_PARTICLES = 400
+PARTICLE_SIZE = 10
+FRAME_INTERVAL_MS = 16
+
+
+class ConfettiOverlay(QWidget):
+    def __init__(self, parent, max_particles=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.brushes = [QBrush(QColor(color)) for color in CONFETTI_COLORS]
+
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self.frame_timer.timeout.connect(self.advance)
+
+        if max_particles is None:
+            max_particles = DEFAULT_MAX_PARTICLES
+        self.set_max_particles(max_particles)
+        parent.installEventFilter(self)
+        self.setGeometry(parent.rect())
+        self.raise_()
+        self.show()
+
+    def set_max_particles(self, max_particles):
+        """Resize the particle pool, dropping any particles in flight"""
+        self.max_particles = max(0, int(max_particles))
+        n = self.max_particles
+        self.active = np.zeros(n, dtype=bool)
+        self.start_ms = np.zeros(n, dtype=np.int64)
+        self.duration_ms = np.ones(n, dtype=np.int64)
+        self.start_x = np.zeros(n, dtype=np.float64)
+        self.drift_x = np.zeros(n, dtype=np.float64)
+        self.color = np.zeros(n, dtype=np.int8)
+        self.frame_timer.stop()
+
+    @property
+    def active_count(self):
+        return int(np.count_nonzero(self.active))
+
+    def burst(self, count, spread_ms=0):
+        """Launch up to ``count`` particles, staggered over ``spread_ms``.
+
+        Returns how many were launched; particles beyond the pool size are
+        dropped rather than allocated.
+        """
+        free = np.flatnonzero(~self.active)[:count]
+        n = len(free)
+        if not n:
+            return 0
+        now = self.clock.elapsed()
+        width = max(1, self.width())
+        rng = np.random.default_rng(random.getrandbits(32))
+        self.active[free] = True
+        self.start_ms[free] = now + rng.integers(0, spread_ms + 1, n)
+        self.duration_ms[free] = rng.integers(1500, 3001, n)
+        self.start_x[free] = rng.integers(0, width + 1, n)
+        self.drift_x[free] = rng.integers(-100, 101, n)
+        self.color[free] = rng.integers(0, len(self.brushes), n)
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+        return n
+
+    def clear(self):
+        self.active[:] = False
+        self.frame_timer.stop()
+        self.update()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QEvent.Type.Resize:
+            self.setGeometry(obj.rect())
+            self.raise_()
+        return super().eventFilter(obj, event)
+
+    def progress(self):
+        return (self.clock.elapsed() - self.start_ms) / self.duration_ms
+
+    def advance(self):
+        """Retire finished particles and schedule a repaint"""
+        self.active &= self.progress() < 1.0
+        if not self.active.any():
+            self.frame_timer.stop()
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.active.any():
+            return
+        progress = self.progress()
+        live = self.active & (progress >= 0.0) & (progress < 1.0)
+        if not live.any():
+            return
+
+        # Same straight fall as the old per-label QPropertyAnimation
+        t = progress[live]
+        xs = (self.start_x[live] + self.drift_x[live] * t).astype(np.int32)
+        ys = (-PARTICLE_SIZE + (self.height() + 2 * PARTICLE_SIZE) * t).astype(np.int32)
+        colors = self.color[live]
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for index, brush in enumerate(self.brushes):
+            mask = colors == index
+            if not mask.any():
+                continue
+            painter.setBrush(brush)
+            for x, y in zip(xs[mask].tolist(), ys[mask].tolist()):
+                painter.drawEllipse(x, y, PARTICLE_SIZE, PARTICLE_SIZE)
+        painter.end()
@@ -0,0 +1,228 @@
+"""Live multi-person age dashboard backed by a table model.
+
+The model holds the roster as an id list and a datetime64 array and never
+creates per-row objects.  Ages are computed with ``age_engine`` in blocks
+of rows the first time the view asks for a cell after each tick, so only
+rows that are actually painted cost anything.  ``DashboardPage.tick`` is
+driven by the main window's clock and emits ``dataChanged`` only for the
+visible rows and the columns whose values changed.  Years, months and
+days to the next birthday come from a ``DayCache``, so a tick only redoes
+the time-of-day part for each row.  Milestones across the whole roster
+come from one ``MilestoneScheduler`` that sleeps until the next one is
+due.
+"""
+import datetime
+
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QFileDialog, QHBoxLayout, QHeaderView, QLabel,
+                             QPushButton, QTableView, QVBoxLayout, QWidget)
+
+from batch import load_roster
+from day_cache import DayCache
+from effects import MilestoneTimer
+from milestones import MilestoneScheduler
+
+BLOCK_ROWS = 256
+# Distinct birth dates kept for the current day; a roster rarely has more
+DAY_CACHE_SIZE = 50_000
+ROW_HEIGHT = 28
+BIRTH_COLUMN_WIDTH = 180
+HEADERS = ("ID", "Born", "Years", "Months", "Days", "Time", "Next birthday")
+ID_COLUMN, BIRTH_COLUMN, YEARS_COLUMN, MONTHS_COLUMN, DAYS_COLUMN, \
+    TIME_COLUMN, BIRTHDAY_COLUMN = range(len(HEADERS))
+
+
+def local_clock():
+    """Current naive local time as datetime64[ms], the roster's time base"""
+    return np.datetime64(datetime.datetime.now(), 'ms')
+
+
+class AgeTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ids = []
+        self.births = np.empty(0, dtype='datetime64[s]')
+        self.now = np.datetime64(datetime.datetime.now(), 's')
+        self.blocks = {}
+        self.day_cache = DayCache(maxsize=DAY_CACHE_SIZE)
+
+    def set_roster(self, ids, births):
+        self.beginResetModel()
+        self.ids = list(ids)
+        self.births = np.asarray(births, dtype='datetime64[s]')
+        self.blocks = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def compute_rows(self, start, stop):
+        """Column arrays of display values for rows start..stop-1"""
+        births = self.births[start:stop]
+        ages, days_to_birthday = self.day_cache.ages(births, self.now)
+        return {
+            YEARS_COLUMN: ages.years,
+            MONTHS_COLUMN: ages.months,
+            DAYS_COLUMN: ages.days,
+            TIME_COLUMN: ages.seconds_of_day(),
+            BIRTHDAY_COLUMN: days_to_birthday,
+        }
+
+    def block(self, number):
+        block = self.blocks.get(number)
+        if block is None:
+            start = number * BLOCK_ROWS
+            block = self.blocks[number] = self.compute_rows(start, start + BLOCK_ROWS)
+        return block
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == ID_COLUMN:
+            return str(self.ids[row])
+        if column == BIRTH_COLUMN:
+            return str(self.births[row]).replace('T', ' ')
+        value = int(self.block(row // BLOCK_ROWS)[column][row % BLOCK_ROWS])
+        if column == TIME_COLUMN:
+            return f"{value // 3600:02d}:{value % 3600 // 60:02d}:{value % 60:02d}"
+        if column == BIRTHDAY_COLUMN:
+            return "🎉 Today" if value == 0 else f"in {value} days"
+        return str(value)
+
+    def advance(self, now, first_row, last_row):
+        """Move the clock to ``now`` and notify views about rows first..last.
+
+        The visible blocks are computed once at the new time and kept for
+        the repaint; the previous tick's blocks are what they're compared to.
+        """
+        previous, self.blocks = self.blocks, {}
+        self.now = np.datetime64(now, 's')
+        if first_row > last_row:
+            return
+        numbers = range(first_row // BLOCK_ROWS, last_row // BLOCK_ROWS + 1)
+        start = numbers[0] * BLOCK_ROWS
+        current = self.compute_rows(start, (numbers[-1] + 1) * BLOCK_ROWS)
+        for number in numbers:
+            offset = number * BLOCK_ROWS - start
+            self.blocks[number] = {column: values[offset:offset + BLOCK_ROWS]
+                                   for column, values in current.items()}
+        visible = slice(first_row - start, last_row + 1 - start)
+        # Blocks the view never asked for have nothing to compare against
+        known = all(number in previous for number in numbers)
+        for column, values in current.items():
+            if known:
+                before = np.concatenate([previous[number][column] for number in numbers])
+                if np.array_equal(before[visible], values[visible]):
+                    continue
+            self.dataChanged.emit(self.index(first_row, column),
+                                  self.index(last_row, column),
+                                  [Qt.ItemDataRole.DisplayRole])
+
+
+class DashboardPage(QWidget):
+    def __init__(self, on_back, on_stats=None):
+        super().__init__()
+        self.on_stats = on_stats
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        title = QLabel("Team Dashboard")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setFont(QFont('Segoe UI', 24, QFont.Weight.Bold))
+        title.setProperty("role", "title")
+
+        self.model = AgeTableModel(self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setAlternatingRowColors(True)
+        self.view.setShowGrid(False)
+        self.view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        # Fixed row heights and column modes keep scrolling independent of row count
+        vertical = self.view.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(ROW_HEIGHT)
+        vertical.hide()
+        horizontal = self.view.horizontalHeader()
+        horizontal.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        horizontal.setSectionResizeMode(BIRTH_COLUMN, QHeaderView.ResizeMode.Fixed)
+        horizontal.resizeSection(BIRTH_COLUMN, BIRTH_COLUMN_WIDTH)
+        self.view.setObjectName("dashboardTable")
+
+        self.milestone_timer = MilestoneTimer(local_clock, self)
+        self.milestone_timer.milestone.connect(self.on_milestone)
+        self.roster_text = ""
+
+        self.status_label = QLabel("No roster loaded")
+        self.status_label.setProperty("role", "subtitle")
+
+        nav_layout = QHBoxLayout()
+        back_btn = QPushButton("◀ Back")
+        back_btn.clicked.connect(on_back)
+        load_btn = QPushButton("📂 Load Roster")
+        load_btn.clicked.connect(self.choose_roster)
+        nav_layout.addWidget(back_btn)
+        nav_layout.addStretch()
+        nav_layout.addWidget(self.status_label)
+        nav_layout.addStretch()
+        if on_stats is not None:
+            stats_btn = QPushButton("📊 Statistics")
+            stats_btn.clicked.connect(self.show_stats)
+            nav_layout.addWidget(stats_btn)
+        nav_layout.addWidget(load_btn)
+
+        layout.addWidget(title)
+        layout.addWidget(self.view)
+        layout.addLayout(nav_layout)
+
+    def choose_roster(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Roster", "", "Rosters (*.csv *.jsonl *.ndjson *.agerec)")
+        if path:
+            self.load(path)
+
+    def load(self, path):
+        try:
+            ids, births = load_roster(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.status_label.setText(f"Could not load roster: {e}")
+            return False
+        self.model.set_roster(ids, births)
+        self.milestone_timer.set_scheduler(
+            MilestoneScheduler.from_births(ids, births, local_clock()))
+        self.roster_text = f"{len(ids):,} people"
+        self.status_label.setText(self.roster_text)
+        return True
+
+    def show_stats(self):
+        if len(self.model.births):
+            self.on_stats(self.model.births, self.roster_text)
+        else:
+            self.on_stats()
+
+    def on_milestone(self, event):
+        self.status_label.setText(
+            f"{self.roster_text} · 🎯 {event.person_id} reached {event.describe()}")
+
+    def visible_rows(self):
+        rows = self.model.rowCount()
+        if not rows:
+            return 0, -1
+        first = max(0, self.view.rowAt(0))
+        last = self.view.rowAt(self.view.viewport().height() - 1)
+        return first, rows - 1 if last < 0 else last
+
+    def tick(self, now):
+        self.model.advance(now, *self.visible_rows())
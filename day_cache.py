@@ -0,0 +1,307 @@
+"""Cache of the day-level part of age calculations.
+
+Whole years and months, the date the last of them was completed on and
+the next birthday depend only on the birth date and the reference date
+(both wall dates in the zone the age is reported in), not on the times of
+day.  ``DayCache`` keeps those results per (birth date, reference date)
+in an in-memory LRU, optionally backed by a SQLite file so later runs
+over the same roster start warm, and every record then only needs its
+sub-day remainder: comparing two times of day and one subtraction.
+
+Many people share a birth date, so a chunk is reduced to its distinct
+keys before anything is looked up.  Hits, disk hits and misses are
+counted per record.
+"""
+import os
+from itertools import repeat
+
+import numpy as np
+
+import calendar_tables
+import timezones
+from age_engine import AgeBatch, reference_time, split_elapsed, to_datetime64
+from calendar_tables import split_days
+
+DEFAULT_MAXSIZE = 200_000
+DEFAULT_MAX_ROWS = 5_000_000
+# Bump when the calendar rules change, so stale files are rebuilt
+SCHEMA_VERSION = 1
+# Keys per SQLite query, well below the bound-parameter limit
+QUERY_BATCH = 900
+_BIRTH_OFFSET = 1 << 31
+
+
+def _keys(birth_days, ref_days):
+    return (ref_days << 32) + (birth_days + _BIRTH_OFFSET)
+
+
+def _split_keys(keys):
+    return (keys & 0xFFFFFFFF) - _BIRTH_OFFSET, keys >> 32
+
+
+def _pack(ref_days, values):
+    """One int per entry: month steps and three small offsets from the reference date"""
+    offsets = np.stack([ref_days - values[:, 1], ref_days - values[:, 2],
+                        values[:, 3] - ref_days], axis=1)
+    return (values[:, 0] << 48) | (offsets[:, 0] << 32) | (offsets[:, 1] << 16) | offsets[:, 2]
+
+
+def _unpack(ref_days, packed):
+    return np.stack([packed >> 48, ref_days - ((packed >> 32) & 0xFFFF),
+                     ref_days - ((packed >> 16) & 0xFFFF), ref_days + (packed & 0xFFFF)], axis=1)
+
+
+def day_parts(birth_days, ref_days, feb29='mar1'):
+    """Uncached day-level results as an (n, 4) array of day numbers.
+
+    Columns: whole month steps, the date of the last step on or before the
+    reference date, the step before it when that date is the reference
+    date itself (otherwise the same date again), and the next birthday.
+    """
+    birth = birth_days.astype('datetime64[D]').astype('datetime64[s]')
+    ref = ref_days.astype('datetime64[D]').astype('datetime64[s]')
+    years, months, anniversary = calendar_tables.ymd_difference(birth, ref, feb29)
+    steps = years * 12 + months
+    anniversary = anniversary.astype('datetime64[D]').astype(np.int64)
+    previous = anniversary.copy()
+    # Only needed if the birth time turns out to be later than "now" on the day
+    today = anniversary == ref_days
+    if np.any(today):
+        year, month, day = split_days(birth_days[today])
+        previous[today] = calendar_tables.add_months(year, month, day, steps[today] - 1, feb29)
+    birthday = calendar_tables.next_birthday(birth_days, ref_days, feb29)
+    return np.stack([steps, anniversary, previous, birthday], axis=1).astype(np.int64)
+
+
+class DayCache:
+    """LRU (plus optional SQLite file) of ``day_parts`` results.
+
+    Recency is tracked per ``lookup`` call, so a whole chunk's keys are
+    refreshed or evicted together with array operations.  ``maxsize``
+    bounds the entries held in memory; ``max_rows`` bounds the
+    file, which drops the entries with the oldest reference dates first.
+    Pickling keeps only the settings, so worker processes reopen the file.
+    """
+
+    def __init__(self, path=None, maxsize=DEFAULT_MAXSIZE, max_rows=DEFAULT_MAX_ROWS,
+                 feb29='mar1'):
+        calendar_tables.check_policy(feb29)
+        self.path = path
+        self.maxsize = maxsize
+        self.max_rows = max_rows
+        self.feb29 = feb29
+        # Entries live in rows of ``values``; ``slots`` maps keys to rows and
+        # ``used`` holds the lookup each row was last used by
+        self.slots = {}
+        self.values = np.empty((0, 4), dtype=np.int64)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.used = np.empty(0, dtype=np.int64)
+        self.clock = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.db = None
+        self.rows = 0
+        if path is not None:
+            self._open()
+
+    def __reduce__(self):
+        return DayCache, (self.path, self.maxsize, self.max_rows, self.feb29)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        import sqlite3
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        try:
+            # Sharded batch workers share the file
+            self.db = sqlite3.connect(self.path, timeout=60)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            version = self.db.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self.db.execute("DROP TABLE IF EXISTS day_parts")
+                self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS day_parts ("
+                "ref INTEGER NOT NULL, birth INTEGER NOT NULL, feb29 TEXT NOT NULL, "
+                "parts INTEGER NOT NULL, "
+                "PRIMARY KEY (ref, birth, feb29))")
+            self.db.commit()
+            self.rows = self.db.execute("SELECT COUNT(*) FROM day_parts").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            self.close()
+            raise OSError(f"can't use {self.path} as a day cache: {e}") from e
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def counts(self):
+        return self.hits, self.disk_hits, self.misses
+
+    def add_counts(self, counts):
+        """Fold in ``counts()`` of another cache, e.g. a worker's"""
+        hits, disk_hits, misses = counts
+        self.hits += hits
+        self.disk_hits += disk_hits
+        self.misses += misses
+
+    def summary(self):
+        total = self.hits + self.disk_hits + self.misses
+        rate = (self.hits + self.disk_hits) / total if total else 0
+        return (f"Day cache: {rate:.1%} hits ({self.hits:,} memory, {self.disk_hits:,} disk, "
+                f"{self.misses:,} computed)")
+
+    def _load(self, keys):
+        """(found mask, rows found) for sorted ``keys`` from the file"""
+        births, refs = _split_keys(keys)
+        found = np.zeros(len(keys), dtype=bool)
+        rows = np.empty((len(keys), 4), dtype=np.int64)
+        for ref in np.unique(refs).tolist():
+            wanted = np.flatnonzero(refs == ref)
+            query = ("SELECT birth, parts FROM day_parts "
+                     "WHERE ref = ? AND feb29 = ? AND ")
+            if len(wanted) <= QUERY_BATCH:
+                part = births[wanted].tolist()
+                result = self.db.execute(query + f"birth IN ({','.join('?' * len(part))})",
+                                         [ref, self.feb29, *part]).fetchall()
+            else:
+                # One range scan; a reference date has at most one row per calendar day
+                result = self.db.execute(query + "birth BETWEEN ? AND ?",
+                                         (ref, self.feb29, int(births[wanted[0]]),
+                                          int(births[wanted[-1]]))).fetchall()
+            if not result:
+                continue
+            result = np.array(result, dtype=np.int64)
+            result = result[np.argsort(result[:, 0], kind='stable')]
+            position = np.minimum(np.searchsorted(result[:, 0], births[wanted]), len(result) - 1)
+            hit = result[position, 0] == births[wanted]
+            found[wanted[hit]] = True
+            rows[wanted[hit]] = _unpack(ref, result[position[hit], 1])
+        return found, rows[found]
+
+    def _store(self, keys, values):
+        births, refs = _split_keys(keys)
+        cursor = self.db.executemany(
+            "INSERT OR IGNORE INTO day_parts VALUES (?, ?, ?, ?)",
+            zip(refs.tolist(), births.tolist(), repeat(self.feb29),
+                _pack(refs, values).tolist()))
+        # Keys another process stored first are ignored, not added
+        self.rows += max(cursor.rowcount, 0)
+        if self.rows > self.max_rows:
+            self.db.execute(
+                "DELETE FROM day_parts WHERE rowid IN "
+                "(SELECT rowid FROM day_parts ORDER BY ref LIMIT ?)", (self.rows - self.max_rows,))
+            self.rows = self.db.execute("SELECT COUNT(*) FROM day_parts").fetchone()[0]
+        self.db.commit()
+
+    def lookup(self, birth_days, ref_days, count=True):
+        """``day_parts`` for day-number arrays, from the cache where possible.
+
+        ``count=False`` leaves the hit counters alone, for second lookups
+        made for records that were counted already.
+        """
+        keys = _keys(np.asarray(birth_days, dtype=np.int64).ravel(),
+                     np.asarray(ref_days, dtype=np.int64).ravel())
+        unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        if not count:
+            counts = np.zeros_like(counts)
+        self.clock += 1
+        get = self.slots.get
+        slots = np.array([get(key, -1) for key in unique.tolist()], dtype=np.int64)
+        found = slots >= 0
+        values = np.empty((len(unique), 4), dtype=np.int64)
+        values[found] = self.values[slots[found]]
+        self.used[slots[found]] = self.clock
+        self.hits += int(counts[found].sum())
+        missing = np.flatnonzero(~found)
+        if len(missing) and self.db is not None:
+            on_disk, rows = self._load(unique[missing])
+            values[missing[on_disk]] = rows
+            self.disk_hits += int(counts[missing[on_disk]].sum())
+            self._insert(unique[missing[on_disk]], rows)
+            missing = missing[~on_disk]
+        if len(missing):
+            self.misses += int(counts[missing].sum())
+            births, refs = _split_keys(unique[missing])
+            computed = values[missing] = day_parts(births, refs, self.feb29)
+            self._insert(unique[missing], computed)
+            if self.db is not None:
+                self._store(unique[missing], computed)
+        return values[inverse.reshape(-1)].reshape(np.shape(birth_days) + (4,))
+
+    def _insert(self, keys, rows):
+        """Add new entries, evicting the least recently used ones"""
+        keys, rows = keys[:self.maxsize], rows[:self.maxsize]
+        size = len(self.slots)
+        free = min(len(keys), self.maxsize - size)
+        slots = np.arange(size, size + free)
+        if free < len(keys):
+            # Entries used by the current lookup are the most recent ones
+            evict = len(keys) - free
+            oldest = np.argpartition(self.used[:size], evict - 1)[:evict]
+            for key in self.keys[oldest].tolist():
+                del self.slots[key]
+            slots = np.concatenate([slots, oldest])
+        if len(self.values) < size + free:
+            grown = max(size + free, min(2 * len(self.values), self.maxsize))
+            self.values = np.resize(self.values, (grown, 4))
+            self.keys = np.resize(self.keys, grown)
+            self.used = np.resize(self.used, grown)
+        self.values[slots] = rows
+        self.keys[slots] = keys
+        self.used[slots] = self.clock
+        self.slots.update(zip(keys.tolist(), slots.tolist()))
+
+    def _anniversaries(self, birth_wall, now_wall):
+        """(steps, anniversary wall time, today) with only the sub-day part per record"""
+        birth_days = birth_wall.astype('datetime64[D]')
+        today = now_wall.astype('datetime64[D]')
+        birth_time = birth_wall - birth_days
+        parts = self.lookup(birth_days.astype(np.int64), today.astype(np.int64))
+        steps, anniversary, previous = parts[..., 0], parts[..., 1], parts[..., 2]
+        # The step due today isn't completed before the time of birth
+        late = (anniversary == today.astype(np.int64)) & (birth_time > now_wall - today)
+        steps = steps - late
+        anniversary = np.where(late, previous, anniversary).astype('datetime64[D]') + birth_time
+        return steps, anniversary, parts[..., 3], today
+
+    def ages(self, birth, now=None):
+        """``(compute_ages(birth, now), days_to_birthday)`` using cached day parts"""
+        birth = to_datetime64(birth)
+        now = np.broadcast_to(reference_time(now), birth.shape)
+        steps, anniversary, birthday, today = self._anniversaries(birth, now)
+        years, months = np.divmod(steps, 12)
+        elapsed = (now - anniversary).astype(np.int64)
+        return (AgeBatch.from_columns(years, months, *split_elapsed(elapsed)),
+                birthday - today.astype(np.int64))
+
+    def zoned_ages(self, birth, birth_zones, now_utc=None, ref_zones=None):
+        """``compute_zoned_ages`` plus days to the next birthday, as in ``batch``"""
+        birth = to_datetime64(birth)
+        birth_utc = timezones.to_utc(birth, birth_zones)
+        now_utc = timezones.utc_now() if now_utc is None else reference_time(now_utc)
+        now_local = timezones.from_utc(np.broadcast_to(now_utc, birth.shape), ref_zones)
+        birth_ref = timezones.from_utc(birth_utc, ref_zones)
+        steps, anniversary, birthday, today = self._anniversaries(birth_ref, now_local)
+        years, months = np.divmod(steps, 12)
+        # A wall time skipped by DST can map back a little after "now"
+        elapsed = np.maximum(
+            (now_utc - timezones.to_utc(anniversary, ref_zones)).astype(np.int64), 0)
+        # Birthdays fall on the birth's own calendar date
+        birth_days = birth.astype('datetime64[D]')
+        moved = birth_days != birth_ref.astype('datetime64[D]')
+        if np.any(moved):
+            birthday = birthday.copy()
+            birthday[moved] = self.lookup(birth_days[moved].astype(np.int64),
+                                          today[moved].astype(np.int64), count=False)[:, 3]
+        return (AgeBatch.from_columns(years, months, *split_elapsed(elapsed)),
+                birthday - today.astype(np.int64))
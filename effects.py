@@ -0,0 +1,90 @@
+"""Lifecycle management for the birthday celebration effect and milestone alerts."""
+import numpy as np
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+INITIAL_BURST = 50
+INITIAL_SPREAD_MS = 2000
+REPEAT_BURST = 20
+REPEAT_INTERVAL_MS = 3000
+# QTimer intervals are int milliseconds; longer waits are split into steps
+MAX_WAIT_MS = 24 * 3600 * 1000
+
+
+class CelebrationScheduler(QObject):
+    """Owns the confetti timer for one birthday session at a time.
+
+    ``start`` may be called on every tick: only the first call of a session
+    launches the initial burst and starts the repeat timer.  ``stop`` ends
+    the session, stops the timer and clears any particles still falling.
+    There is only ever one repeat timer, created up front.
+    """
+
+    def __init__(self, overlay, parent=None):
+        super().__init__(parent)
+        self.overlay = overlay
+        self.repeat_timer = QTimer(self)
+        self.repeat_timer.setInterval(REPEAT_INTERVAL_MS)
+        self.repeat_timer.timeout.connect(self.repeat_burst)
+
+    @property
+    def active(self):
+        return self.repeat_timer.isActive()
+
+    def start(self):
+        if self.active:
+            return False
+        self.overlay.burst(INITIAL_BURST, INITIAL_SPREAD_MS)
+        self.repeat_timer.start()
+        return True
+
+    def repeat_burst(self):
+        self.overlay.burst(REPEAT_BURST)
+
+    def stop(self):
+        if not self.active:
+            return False
+        self.repeat_timer.stop()
+        self.overlay.clear()
+        return True
+
+
+class MilestoneTimer(QObject):
+    """Emits ``milestone`` for each event of a ``MilestoneScheduler``.
+
+    A single single-shot timer is armed for the earliest pending milestone,
+    so nothing runs between events.  ``clock`` returns the current time as
+    datetime64 (millisecond precision or finer) in the same time base as
+    the scheduler's births.
+    """
+
+    milestone = pyqtSignal(object)
+
+    def __init__(self, clock, parent=None):
+        super().__init__(parent)
+        self.clock = clock
+        self.scheduler = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.wake)
+
+    def set_scheduler(self, scheduler):
+        self.scheduler = scheduler
+        self.arm()
+
+    def arm(self):
+        due = self.scheduler.next_due() if self.scheduler is not None else None
+        if due is None:
+            self.timer.stop()
+            return
+        wait_ms = (due - self.clock()) // np.timedelta64(1, 'ms')
+        self.timer.start(int(min(max(wait_ms, 0), MAX_WAIT_MS)))
+
+    def wake(self):
+        for event in self.scheduler.pop_due(self.clock()):
+            self.milestone.emit(event)
+        self.arm()
+
+    def stop(self):
+        self.scheduler = None
+        self.timer.stop()
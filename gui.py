@@ -0,0 +1,613 @@
+import sys
+try:
+    from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                               QHBoxLayout, QCalendarWidget, QPushButton, QLabel,
+                               QStackedWidget, QTimeEdit, QFrame, QComboBox,
+                               QCheckBox, QDateEdit)
+    from PyQt6.QtCore import QTimer, QDate, QDateTime, Qt, QTime, QEvent
+    from PyQt6.QtGui import QFont, QKeySequence, QShortcut
+except ImportError:
+    print("Error: PyQt6 is not installed. Please install it using: pip install PyQt6")
+    sys.exit(1)
+
+import datetime
+
+import theme
+from instrumentation import PerfMonitor, settings_from_env, timed
+
+TICK_SLACK_MS = 5
+
+PAGE_WELCOME, PAGE_PICKER, PAGE_RESULT, PAGE_DASHBOARD, PAGE_STATS = range(5)
+# Pages pre-built while idle after the first paint, in this order
+WARM_UP_PAGES = (PAGE_PICKER, PAGE_RESULT)
+WARM_UP_DELAY_MS = 250
+WARM_UP_STEP_MS = 50
+# Quiet period after the last picker change before the preview is recomputed
+PREVIEW_DEBOUNCE_MS = 150
+MILESTONE_BURST = 30
+MILESTONE_SPREAD_MS = 1500
+
+
+def utc_clock():
+    """Current UTC time as naive datetime64[ms], the milestone timers' clock"""
+    import numpy as np
+
+    return np.datetime64(datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None), 'ms')
+
+class ModernFrame(QFrame):
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("modernFrame")
+
+class ModernButton(QPushButton):
+    def __init__(self, text, accent="info"):
+        super().__init__(text)
+        # Styled by the application theme; accepts an accent name or hex color
+        self.setProperty("accent", theme.accent_key(accent))
+
+class AgeCalculator(QMainWindow):
+    # Set to a PerfMonitor by enable_perf; events can arrive before __init__ ends
+    perf = None
+
+    def __init__(self, max_particles=None, theme_name=theme.DEFAULT_THEME,
+                 warm_up=True, perf=None, perf_log=None):
+        super().__init__()
+        self.setWindowTitle("Modern Age Calculator")
+        self.setMinimumSize(900, 700)
+        
+        # Set up main widget with gradient background
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        
+        # Gradient background and all widget styles come from the app theme
+        theme.ensure_installed(QApplication.instance(), theme_name)
+        QShortcut(QKeySequence("Ctrl+T"), self, activated=self.cycle_theme)
+        
+        # Create stacked widget for multiple pages
+        self.stacked_widget = QStackedWidget()
+        layout = QVBoxLayout(main_widget)
+        layout.addWidget(self.stacked_widget)
+        
+        # Only the welcome page is built up front; the others are created on
+        # first navigation or while idle after the first paint
+        self.create_welcome_page()
+        self.page_builders = {
+            PAGE_PICKER: self.create_date_picker_page,
+            PAGE_RESULT: self.create_result_page,
+            PAGE_DASHBOARD: self.create_dashboard_page,
+            PAGE_STATS: self.create_stats_page,
+        }
+        for _ in self.page_builders:
+            self.stacked_widget.addWidget(QWidget())
+        self.warm_up_pending = list(WARM_UP_PAGES) if warm_up else []
+        self.shown_once = False
+        
+        self.max_particles = max_particles
+        self.celebration = None
+        self.ticker = None
+        self._local_zone = None
+        # Fixed time the result page measures against instead of now
+        self.reference_time = None
+        self.preview_cache = None
+        # Labels are only updated when their text actually changes
+        self.label_texts = {}
+        self.stats_return_page = PAGE_WELCOME
+        self.stacked_widget.currentChanged.connect(self.on_page_changed)
+        
+        # Timer for real-time updates
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.on_tick)
+        
+        # Hot-path instrumentation, off unless asked for (see instrumentation.py)
+        if perf is None:
+            perf, env_log = settings_from_env()
+            perf_log = perf_log or env_log
+        if perf or perf_log:
+            self.enable_perf(perf_log)
+        self.schedule_tick()
+
+    def enable_perf(self, log_path=None):
+        self.perf = PerfMonitor(self, log_path)
+        QShortcut(QKeySequence("F12"), self, activated=self.perf.toggle_overlay)
+
+    def closeEvent(self, event):
+        # Removes the app-wide event filter and closes the --perf-log file
+        if self.perf is not None:
+            self.perf.close()
+        super().closeEvent(event)
+
+    def event(self, event):
+        # The top-level UpdateRequest is where every dirty widget gets painted
+        if self.perf is None or event.type() != QEvent.Type.UpdateRequest:
+            return super().event(event)
+        with self.perf.timing('paint'):
+            return super().event(event)
+
+    @property
+    def local_zone(self):
+        # timezones pulls in NumPy, so it is only imported once a page needs it
+        if self._local_zone is None:
+            import timezones
+            self._local_zone = timezones.local_zone()
+        return self._local_zone
+
+    @timed('page_build')
+    def ensure_page(self, index):
+        """Build page ``index`` if it is still a placeholder"""
+        builder = self.page_builders.pop(index, None)
+        if builder is None:
+            return
+        page = builder()
+        placeholder = self.stacked_widget.widget(index)
+        # Swapping widgets shifts indices around; don't let that look like navigation
+        self.stacked_widget.blockSignals(True)
+        self.stacked_widget.insertWidget(index, page)
+        self.stacked_widget.removeWidget(placeholder)
+        self.stacked_widget.blockSignals(False)
+        placeholder.deleteLater()
+
+    def show_page(self, index):
+        self.ensure_page(index)
+        self.stacked_widget.setCurrentIndex(index)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.shown_once:
+            self.shown_once = True
+            QTimer.singleShot(WARM_UP_DELAY_MS, self.warm_up_next)
+
+    def warm_up_next(self):
+        """Build one pending page per idle slot so the UI stays responsive"""
+        while self.warm_up_pending:
+            index = self.warm_up_pending.pop(0)
+            if index in self.page_builders:
+                self.ensure_page(index)
+                break
+        if self.warm_up_pending:
+            QTimer.singleShot(WARM_UP_STEP_MS, self.warm_up_next)
+
+    def create_welcome_page(self):
+        welcome_widget = QWidget()
+        layout = QVBoxLayout(welcome_widget)
+        layout.setSpacing(30)
+        
+        # Create glass-morphism container
+        container = ModernFrame()
+        container_layout = QVBoxLayout(container)
+        
+        # Welcome message
+        welcome_label = QLabel("✨ Age Calculator")
+        welcome_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        welcome_label.setFont(QFont('Segoe UI', 32, QFont.Weight.Bold))
+        welcome_label.setProperty("role", "title")
+        
+        # Description
+        desc_label = QLabel("Discover your journey through time")
+        desc_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        desc_label.setFont(QFont('Segoe UI', 16))
+        desc_label.setObjectName("descLabel")
+        desc_label.setProperty("role", "subtitle")
+        
+        # Start button
+        start_btn = ModernButton("Begin Journey", "primary")
+        start_btn.setFixedSize(200, 50)
+        start_btn.clicked.connect(lambda: self.show_page(PAGE_PICKER))
+        
+        # Dashboard button
+        dashboard_btn = ModernButton("👥 Team Dashboard", "muted")
+        dashboard_btn.setFixedSize(200, 50)
+        dashboard_btn.clicked.connect(lambda: self.show_page(PAGE_DASHBOARD))
+        
+        # Page indicator
+        page_indicator = QLabel("1/3")
+        page_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        page_indicator.setProperty("role", "pageIndicator")
+        
+        container_layout.addStretch()
+        container_layout.addWidget(welcome_label)
+        container_layout.addWidget(desc_label)
+        container_layout.addWidget(start_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+        container_layout.addWidget(dashboard_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+        container_layout.addStretch()
+        container_layout.addWidget(page_indicator)
+        
+        layout.addStretch()
+        layout.addWidget(container)
+        layout.addStretch()
+        
+        self.stacked_widget.addWidget(welcome_widget)
+
+    def create_date_picker_page(self):
+        import timezones
+        from calendar_tables import DEFAULT_YEAR_RANGE
+        
+        # Dates the calendar tables cover; next birthdays can be a year later
+        first_date = QDate(DEFAULT_YEAR_RANGE[0], 1, 1)
+        last_date = QDate(DEFAULT_YEAR_RANGE[1] - 1, 12, 31)
+        
+        picker_widget = QWidget()
+        layout = QVBoxLayout(picker_widget)
+        layout.setSpacing(20)
+        
+        # Create glass-morphism container
+        container = ModernFrame()
+        container_layout = QVBoxLayout(container)
+        
+        # Title
+        title = QLabel("Select Your Birth Date & Time")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setFont(QFont('Segoe UI', 24, QFont.Weight.Bold))
+        title.setObjectName("pickerTitle")
+        title.setProperty("role", "title")
+        
+        # Calendar with modern styling
+        self.calendar = QCalendarWidget()
+        self.calendar.setFixedHeight(350)
+        self.calendar.setObjectName("birthCalendar")
+        self.calendar.setDateRange(first_date, last_date)
+        
+        # Time picker
+        time_widget = QWidget()
+        time_layout = QHBoxLayout(time_widget)
+        
+        class CustomTimeEdit(QTimeEdit):
+            def __init__(self):
+                super().__init__()
+                self.setDisplayFormat("HH : mm : ss")
+                self.setMinimumWidth(200)
+                self.setFixedHeight(40)
+                self.setObjectName("birthTimeEdit")
+
+        self.time_edit = CustomTimeEdit()
+        
+        time_label = QLabel("Time of Birth:")
+        time_label.setObjectName("timeLabel")
+        
+        # Zone the birth time was recorded in; ages are shown in the local zone
+        zone_label = QLabel("Time Zone:")
+        zone_label.setObjectName("timeLabel")
+        self.zone_combo = QComboBox()
+        self.zone_combo.setObjectName("birthZoneCombo")
+        self.zone_combo.setEditable(True)
+        self.zone_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.zone_combo.addItems(timezones.zone_names())
+        self.zone_combo.setCurrentText(timezones.zone_name(self.local_zone))
+        
+        time_layout.addStretch()
+        time_layout.addWidget(time_label)
+        time_layout.addWidget(self.time_edit)
+        time_layout.addWidget(zone_label)
+        time_layout.addWidget(self.zone_combo)
+        time_layout.addStretch()
+        
+        # Optional "age on date X" instead of the live age
+        reference_widget = QWidget()
+        reference_layout = QHBoxLayout(reference_widget)
+        self.reference_check = QCheckBox("Age at the end of:")
+        self.reference_check.setObjectName("referenceCheck")
+        self.reference_edit = QDateEdit(QDate.currentDate())
+        self.reference_edit.setObjectName("referenceDateEdit")
+        self.reference_edit.setDateRange(first_date, last_date)
+        self.reference_edit.setCalendarPopup(True)
+        self.reference_edit.setDisplayFormat("MMMM d, yyyy")
+        self.reference_edit.setEnabled(False)
+        self.reference_check.toggled.connect(self.reference_edit.setEnabled)
+        reference_layout.addStretch()
+        reference_layout.addWidget(self.reference_check)
+        reference_layout.addWidget(self.reference_edit)
+        reference_layout.addStretch()
+        
+        # Live preview; fixed height so text changes never relayout the page
+        self.preview_label = QLabel()
+        self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.preview_label.setObjectName("previewLabel")
+        self.preview_label.setFixedHeight(self.preview_label.fontMetrics().lineSpacing() * 2 + 12)
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.update_preview)
+        # Only a new selection matters; paging through months changes nothing
+        for signal in (self.calendar.selectionChanged, self.time_edit.timeChanged,
+                       self.zone_combo.currentTextChanged, self.reference_check.toggled,
+                       self.reference_edit.dateChanged):
+            signal.connect(self.preview_timer.start)
+        
+        # Navigation
+        nav_layout = QHBoxLayout()
+        back_btn = ModernButton("◀ Back", "muted")
+        next_btn = ModernButton("Calculate Age", "primary")
+        
+        back_btn.clicked.connect(lambda: self.show_page(PAGE_WELCOME))
+        next_btn.clicked.connect(self.calculate_and_show_result)
+        
+        page_indicator = QLabel("2/3")
+        page_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        page_indicator.setProperty("role", "pageIndicator")
+        
+        nav_layout.addWidget(back_btn)
+        nav_layout.addStretch()
+        nav_layout.addWidget(page_indicator)
+        nav_layout.addStretch()
+        nav_layout.addWidget(next_btn)
+        
+        container_layout.addWidget(title)
+        container_layout.addWidget(self.calendar)
+        container_layout.addWidget(time_widget)
+        container_layout.addWidget(reference_widget)
+        container_layout.addWidget(self.preview_label)
+        container_layout.addLayout(nav_layout)
+        
+        layout.addStretch()
+        layout.addWidget(container)
+        layout.addStretch()
+        
+        return picker_widget
+
+    def create_result_page(self):
+        from confetti import ConfettiOverlay
+        from effects import CelebrationScheduler, MilestoneTimer
+        
+        result_widget = QWidget()
+        layout = QVBoxLayout(result_widget)
+        layout.setSpacing(20)
+        
+        # Single overlay that paints all confetti particles
+        self.confetti = ConfettiOverlay(self, self.max_particles)
+        self.celebration = CelebrationScheduler(self.confetti, self)
+        # Sleeps until the person's next milestone instead of checking every tick
+        self.milestone_timer = MilestoneTimer(utc_clock, self)
+        self.milestone_timer.milestone.connect(self.on_milestone)
+        
+        self.age_label = QLabel("Your age is:")
+        self.age_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.age_label.setFont(QFont('Arial', 14))
+        self.age_label.setObjectName("ageLabel")
+        
+        self.detailed_age_label = QLabel()
+        self.detailed_age_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.detailed_age_label.setFont(QFont('Arial', 12))
+        self.detailed_age_label.setObjectName("detailedAgeLabel")
+        
+        self.next_birthday_label = QLabel()
+        self.next_birthday_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.next_birthday_label.setFont(QFont('Arial', 12))
+        self.next_birthday_label.setObjectName("nextBirthdayLabel")
+        
+        self.milestone_label = QLabel()
+        self.milestone_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.milestone_label.setFont(QFont('Arial', 12))
+        self.milestone_label.setObjectName("milestoneLabel")
+        
+        self.celebration_label = QLabel("🎉 Happy Birthday! 🎂")
+        self.celebration_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.celebration_label.setFont(QFont('Arial', 24, QFont.Weight.Bold))
+        self.celebration_label.setObjectName("celebrationLabel")
+        # Keep the layout stable when the banner is toggled
+        policy = self.celebration_label.sizePolicy()
+        policy.setRetainSizeWhenHidden(True)
+        self.celebration_label.setSizePolicy(policy)
+        self.celebration_label.setVisible(False)
+        
+        # Navigation buttons
+        nav_layout = QHBoxLayout()
+        
+        back_btn = QPushButton("◀ Back")
+        back_btn.clicked.connect(lambda: self.show_page(PAGE_PICKER))
+        
+        home_btn = QPushButton("🏠 Home")
+        home_btn.clicked.connect(self.go_home)
+        home_btn.setObjectName("homeButton")
+        
+        stats_btn = QPushButton("📊 Roster Stats")
+        stats_btn.clicked.connect(lambda: self.show_stats())
+        
+        # Add page indicator
+        page_indicator = QLabel("Page 3/3")
+        page_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        page_indicator.setObjectName("resultPageIndicator")
+        
+        nav_layout.addWidget(back_btn)
+        nav_layout.addStretch()
+        nav_layout.addWidget(page_indicator)
+        nav_layout.addStretch()
+        nav_layout.addWidget(stats_btn)
+        nav_layout.addWidget(home_btn)
+        
+        layout.addStretch()
+        layout.addWidget(self.age_label)
+        layout.addWidget(self.detailed_age_label)
+        layout.addWidget(self.next_birthday_label)
+        layout.addWidget(self.milestone_label)
+        layout.addWidget(self.celebration_label)
+        layout.addLayout(nav_layout)
+        layout.addStretch()
+        
+        return result_widget
+
+    @timed('theme_install')
+    def cycle_theme(self):
+        """Switch to the next theme at runtime"""
+        theme.install(QApplication.instance(), theme.next_theme(theme.current_theme()))
+
+    def on_page_changed(self, index):
+        if index != PAGE_RESULT and self.celebration is not None:
+            self.celebration.stop()
+        # The stats page returns to the result, anywhere else ends the session
+        if index in (PAGE_WELCOME, PAGE_PICKER) and self.celebration is not None:
+            self.milestone_timer.stop()
+        if index == PAGE_PICKER:
+            self.update_preview()
+
+    def create_dashboard_page(self):
+        from dashboard import DashboardPage
+        
+        self.dashboard = DashboardPage(lambda: self.show_page(PAGE_WELCOME), self.show_stats)
+        return self.dashboard
+
+    def create_stats_page(self):
+        from stats_page import StatsPage
+        
+        self.stats_page = StatsPage(lambda: self.show_page(self.stats_return_page))
+        return self.stats_page
+
+    def show_stats(self, births=None, source=""):
+        """Open the statistics page, optionally for births already in memory"""
+        self.stats_return_page = self.stacked_widget.currentIndex()
+        self.ensure_page(PAGE_STATS)
+        if births is not None:
+            self.stats_page.show_births(births, source)
+        self.show_page(PAGE_STATS)
+
+    def show_dashboard(self, roster_path=None):
+        self.ensure_page(PAGE_DASHBOARD)
+        if roster_path:
+            self.dashboard.load(roster_path)
+        self.show_page(PAGE_DASHBOARD)
+
+    def picker_birth(self, fix_zone=False):
+        """Aware birth datetime from the picker; an unknown zone means the local one"""
+        import timezones
+        
+        birth_time = self.time_edit.time()
+        try:
+            birth_zone = timezones.get_zone(self.zone_combo.currentText().strip())
+        except ValueError:
+            birth_zone = self.local_zone
+            if fix_zone:
+                self.zone_combo.setCurrentText(timezones.zone_name(birth_zone))
+        return datetime.datetime.combine(
+            self.calendar.selectedDate().toPyDate(),
+            datetime.time(birth_time.hour(), birth_time.minute(), birth_time.second()),
+            tzinfo=birth_zone
+        )
+
+    def picker_reference(self):
+        """End of the picked reference date, or None to measure against now"""
+        if not self.reference_check.isChecked():
+            return None
+        return datetime.datetime.combine(self.reference_edit.date().toPyDate(),
+                                         datetime.time(23, 59, 59), tzinfo=self.local_zone)
+
+    @timed('update_preview')
+    def update_preview(self):
+        if self.stacked_widget.currentIndex() != PAGE_PICKER:
+            return
+        if self.preview_cache is None:
+            from ticker import CalendarCache
+            self.preview_cache = CalendarCache()
+        reference = self.picker_reference()
+        age = self.preview_cache.breakdown(
+            self.picker_birth(), reference or datetime.datetime.now(self.local_zone))
+        if age.years < 0:
+            text = "That date is still in the future"
+        else:
+            text = age.format()
+        self.set_label_text(self.preview_label, text)
+
+    def calculate_and_show_result(self):
+        from milestones import MilestoneScheduler
+        from ticker import AgeTicker
+        
+        self.preview_timer.stop()
+        self.ticker = AgeTicker(self.picker_birth(fix_zone=True))
+        self.reference_time = self.picker_reference()
+        self.show_page(PAGE_RESULT)
+        self.age_label.setText(
+            "Your age is:" if self.reference_time is None
+            else f"Your age at the end of {self.reference_time.strftime('%B %d, %Y')}:")
+        # Milestones are counted from now, which means nothing at a fixed date
+        self.milestone_label.setVisible(self.reference_time is None)
+        if self.reference_time is None:
+            birth_utc = self.ticker.birth_datetime.astimezone(datetime.timezone.utc)
+            self.milestone_timer.set_scheduler(MilestoneScheduler.from_births(
+                [None], [birth_utc.replace(tzinfo=None)], utc_clock()))
+            self.show_next_milestone()
+        else:
+            self.milestone_timer.stop()
+        self.update_age()
+
+    def show_next_milestone(self, reached=None):
+        upcoming = self.milestone_timer.scheduler.upcoming(1)
+        lines = [f"🎯 You just turned {reached.describe()} old!"] if reached else []
+        due = upcoming[0].at.item() if upcoming else None
+        # Milestones after the year 9999 have no datetime to show
+        if isinstance(due, datetime.datetime):
+            when = due.replace(tzinfo=datetime.timezone.utc).astimezone(self.local_zone)
+            names = " & ".join(event.describe() for event in upcoming)
+            lines.append(f"Next milestone: {names} on {when.strftime('%B %d, %Y at %H:%M:%S')}")
+        self.set_label_text(self.milestone_label, "\n".join(lines))
+
+    def on_milestone(self, event):
+        self.show_next_milestone(event)
+        if self.stacked_widget.currentIndex() == PAGE_RESULT:
+            self.create_confetti(MILESTONE_BURST, MILESTONE_SPREAD_MS)
+
+    def schedule_tick(self):
+        # Fire just after the next wall-clock second so updates don't drift
+        msec = QTime.currentTime().msec()
+        delay = 1000 - msec + TICK_SLACK_MS
+        self.timer.start(delay)
+        if self.perf is not None:
+            self.perf.tick_scheduled(delay)
+
+    def on_tick(self):
+        if self.perf is not None:
+            self.perf.tick_fired()
+        # An age at a fixed reference date doesn't change from second to second
+        if self.reference_time is None:
+            self.update_age()
+        if self.stacked_widget.currentIndex() == PAGE_PICKER:
+            self.update_preview()
+        if self.stacked_widget.currentIndex() == PAGE_DASHBOARD:
+            self.tick_dashboard()
+        self.schedule_tick()
+
+    @timed('dashboard_tick')
+    def tick_dashboard(self):
+        self.dashboard.tick(datetime.datetime.now())
+
+    def set_label_text(self, label, text):
+        """Only touch labels whose text actually changed"""
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            label.setText(text)
+
+    @timed('update_age')
+    def update_age(self):
+        if self.stacked_widget.currentIndex() != PAGE_RESULT or self.ticker is None:
+            return
+            
+        current_date = self.reference_time or datetime.datetime.now(self.local_zone)
+        state, age = self.ticker.tick(current_date)
+        
+        if state.is_birthday:
+            self.celebration_label.setVisible(True)
+            self.set_label_text(self.next_birthday_label, "")
+            
+            # Starts the confetti once per birthday session
+            self.celebration.start()
+        else:
+            self.celebration_label.setVisible(False)
+            self.celebration.stop()
+            self.set_label_text(
+                self.next_birthday_label,
+                f"Next birthday in: {state.days_to_birthday} days\n"
+                f"({state.next_birthday.strftime('%B %d, %Y')})"
+            )
+        
+        # Update age display
+        self.set_label_text(self.detailed_age_label, age.format())
+
+    def go_home(self):
+        """Reset and return to home page"""
+        self.show_page(PAGE_WELCOME)
+        self.time_edit.setTime(QTime(0, 0, 0))
+        self.calendar.setSelectedDate(QDateTime.currentDateTime().date())
+        self.reference_check.setChecked(False)
+
+    @timed('create_confetti')
+    def create_confetti(self, count=1, spread_ms=0):
+        """Launch confetti particles from the shared overlay pool"""
+        return self.confetti.burst(count, spread_ms)
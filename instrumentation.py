@@ -0,0 +1,178 @@
+"""Optional hot-path instrumentation for the GUI.
+
+Off unless ``--perf``/``--perf-log`` is given or the ``AGE_CALC_PERF``
+environment variable is set (``1`` for the overlay only, anything else is
+taken as a JSONL file to stream to as well).  When off, instrumented
+methods only pay for one attribute check.
+
+``PerfMonitor`` collects section durations (``update_age``, confetti,
+page builds, paints), tick timer jitter and Qt polish events, and once a
+second turns them into a snapshot together with live QTimer,
+QPropertyAnimation and particle counts.  Snapshots are shown in a
+toggleable overlay (F12) and appended to the JSONL log.
+"""
+import contextlib
+import datetime
+import functools
+import os
+import time
+
+from PyQt6.QtCore import QEvent, QObject, QPropertyAnimation, Qt, QTimer
+from PyQt6.QtWidgets import QApplication, QLabel
+
+ENV_VAR = 'AGE_CALC_PERF'
+SAMPLE_INTERVAL_MS = 1000
+
+
+def settings_from_env():
+    """Return (enabled, log_path) from ``AGE_CALC_PERF``"""
+    value = os.environ.get(ENV_VAR, '').strip()
+    if value in ('', '0'):
+        return False, None
+    return True, (None if value == '1' else value)
+
+
+def timed(section):
+    """Record the duration of a method under ``section`` when ``self.perf`` is set"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            perf = self.perf
+            if perf is None:
+                return method(self, *args)
+            start = time.perf_counter()
+            try:
+                return method(self, *args)
+            finally:
+                perf.record(section, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+
+class _Stat:
+    __slots__ = ('count', 'total', 'peak')
+
+    def __init__(self):
+        self.count, self.total, self.peak = 0, 0.0, 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.peak = max(self.peak, value)
+
+    def summary(self):
+        return {'count': self.count,
+                'mean_ms': round(self.total / self.count, 3) if self.count else None,
+                'max_ms': round(self.peak, 3)}
+
+
+class PerfOverlay(QLabel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setObjectName("perfOverlay")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.move(12, 12)
+
+    def show_snapshot(self, snapshot):
+        lines = []
+        for name, stat in snapshot['sections'].items():
+            lines.append(f"{name:<16}{stat['count']:>5}×  avg {stat['mean_ms']:.3f}  "
+                         f"max {stat['max_ms']:.3f} ms")
+        jitter = snapshot['tick_jitter_ms']
+        if jitter['count']:
+            lines.append(f"{'tick jitter':<16}{jitter['count']:>5}×  avg {jitter['mean_ms']:.3f}  "
+                         f"max {jitter['max_ms']:.3f} ms")
+        lines.append(f"timers {snapshot['timers']}  animations {snapshot['animations']}  "
+                     f"particles {snapshot['particles']}  polish {snapshot['polish_events']}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
+
+
+class PerfMonitor(QObject):
+    """Collects timings for one window and reports them every second"""
+
+    def __init__(self, window, log_path=None, show_overlay=True):
+        super().__init__(window)
+        self.window = window
+        self.sections = {}
+        self.jitter = _Stat()
+        self.polish_events = 0
+        # Resolved here: building the QEvent.Type enum costs a few ms at import
+        self.polish_types = (QEvent.Type.Polish, QEvent.Type.PolishRequest,
+                             QEvent.Type.StyleChange)
+        self.expected_tick = None
+        self.log = open(log_path, 'a', encoding='utf-8') if log_path else None
+        self.overlay = PerfOverlay(window)
+        self.overlay.setVisible(show_overlay)
+        QApplication.instance().installEventFilter(self)
+
+        self.sample_timer = QTimer(self)
+        self.sample_timer.setInterval(SAMPLE_INTERVAL_MS)
+        self.sample_timer.timeout.connect(self.sample)
+        self.sample_timer.start()
+
+    def record(self, section, ms):
+        stat = self.sections.get(section)
+        if stat is None:
+            stat = self.sections[section] = _Stat()
+        stat.add(ms)
+
+    @contextlib.contextmanager
+    def timing(self, section):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, (time.perf_counter() - start) * 1000)
+
+    def tick_scheduled(self, delay_ms):
+        self.expected_tick = time.perf_counter() + delay_ms / 1000
+
+    def tick_fired(self):
+        if self.expected_tick is not None:
+            self.jitter.add(abs(time.perf_counter() - self.expected_tick) * 1000)
+            self.expected_tick = None
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.polish_types:
+            self.polish_events += 1
+        return False
+
+    def toggle_overlay(self):
+        self.overlay.setVisible(not self.overlay.isVisible())
+
+    def snapshot(self):
+        confetti = getattr(self.window, 'confetti', None)
+        return {
+            'time': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'sections': {name: stat.summary() for name, stat in sorted(self.sections.items())},
+            'tick_jitter_ms': self.jitter.summary(),
+            # Running timers only, not counting the sampling timer itself
+            'timers': sum(timer.isActive() for timer in self.window.findChildren(QTimer)
+                          if timer is not self.sample_timer),
+            'animations': len(self.window.findChildren(QPropertyAnimation)),
+            'particles': confetti.active_count if confetti is not None else 0,
+            'polish_events': self.polish_events,
+        }
+
+    def sample(self):
+        snapshot = self.snapshot()
+        self.sections = {}
+        self.jitter = _Stat()
+        self.polish_events = 0
+        if self.overlay.isVisible():
+            self.overlay.show_snapshot(snapshot)
+        if self.log is not None:
+            import json
+
+            self.log.write(json.dumps(snapshot) + '\n')
+            self.log.flush()
+        return snapshot
+
+    def close(self):
+        self.sample_timer.stop()
+        QApplication.instance().removeEventFilter(self)
+        if self.log is not None:
+            self.log.close()
+            self.log = None
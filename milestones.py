@@ -0,0 +1,232 @@
+"""Milestone events such as the 10,000th day or the billionth second.
+
+A milestone is a round number of some time unit since birth, so the next
+one after any moment follows in closed form.  ``MilestoneScheduler`` keeps
+only each person's *next* milestone in a heap ordered by due time, so
+memory grows with the number of people rather than with the number of
+milestones, and the earliest event across the roster is always on top.
+When it is popped the person's following milestone is pushed back.
+
+Heap entries are plain ints, ``(due - base) << ROW_BITS | row``, which
+keeps an entry small and lets ``heapq`` compare them in C.  Removed people
+are tombstoned and compacted away once they make up ``COMPACT_FRACTION``
+of the rows.
+"""
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import NamedTuple
+
+import numpy as np
+
+ROW_BITS = 32
+REMOVED = np.iinfo(np.int64).min
+COMPACT_FRACTION = 0.5
+
+
+class MilestoneRule(NamedTuple):
+    name: str
+    unit_seconds: int
+    # Milestones fall on multiples of this many units
+    every: int
+
+    @property
+    def period(self):
+        return self.unit_seconds * self.every
+
+
+DEFAULT_RULES = (
+    MilestoneRule('days', 86400, 1000),
+    MilestoneRule('weeks', 7 * 86400, 1000),
+    MilestoneRule('hours', 3600, 100_000),
+    MilestoneRule('minutes', 60, 10_000_000),
+    MilestoneRule('seconds', 1, 100_000_000),
+)
+
+
+class MilestoneEvent(NamedTuple):
+    person_id: object
+    rule: MilestoneRule
+    count: int
+    at: np.datetime64
+
+    def describe(self):
+        return f"{self.count:,} {self.rule.name}"
+
+
+def _seconds(values):
+    return np.asarray(values, dtype='datetime64[s]').astype(np.int64)
+
+
+def next_milestones(births, now, rules=DEFAULT_RULES):
+    """Earliest milestone strictly after ``now`` for each birth.
+
+    Returns (due, rule_index) arrays, ``due`` as datetime64[s].  Births and
+    ``now`` must use the same time base (both naive local or both UTC).
+    """
+    births, now = _seconds(births), _seconds(now)
+    best_due = best_rule = None
+    for index, rule in enumerate(rules):
+        count = np.maximum((now - births) // rule.period + 1, 1)
+        due = births + count * rule.period
+        if best_due is None:
+            best_due, best_rule = due, np.zeros(due.shape, dtype=np.int64)
+        else:
+            better = due < best_due
+            best_due = np.where(better, due, best_due)
+            best_rule = np.where(better, index, best_rule)
+    return best_due.astype('datetime64[s]'), best_rule
+
+
+class MilestoneScheduler:
+    """Priority queue of the next milestone of every person in a roster.
+
+    ``births`` are datetime64 values in whatever time base the caller's
+    clock uses.  All times passed in and returned are datetime64[s].
+    ``add`` hands out a handle per person for ``remove``; it is the
+    person's row until the first compaction renumbers the rows.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, now=None):
+        if not rules:
+            raise ValueError("at least one milestone rule is needed")
+        self.rules = tuple(rules)
+        self.ids = []
+        self.births = array('q')
+        self.heap = []
+        self.active = 0
+        self.added = 0
+        # Handle of each row once compaction has renumbered them, else None
+        self.handles = None
+        self.base = None if now is None else int(_seconds(now))
+
+    @classmethod
+    def from_births(cls, ids, births, now, rules=DEFAULT_RULES):
+        scheduler = cls(rules, now)
+        scheduler.add_many(ids, births, now)
+        return scheduler
+
+    def __len__(self):
+        return self.active
+
+    def _key(self, due, row):
+        return (due - self.base) << ROW_BITS | row
+
+    def _next_after(self, birth, after):
+        return min(birth + max((after - birth) // rule.period + 1, 1) * rule.period
+                   for rule in self.rules)
+
+    def add(self, person_id, birth, now):
+        """Start tracking one person; returns their handle for ``remove``"""
+        return self.add_many([person_id], [birth], now)
+
+    def add_many(self, ids, births, now):
+        """Start tracking many people at once; returns the first new handle.
+
+        The others follow consecutively.
+        """
+        births = _seconds(births)
+        if self.base is None:
+            self.base = int(_seconds(now))
+        first = self.added
+        self.added += len(births)
+        if self.handles is not None:
+            self.handles.extend(range(first, self.added))
+        due, _ = next_milestones(births, now, self.rules)
+        offsets = due.astype(np.int64) - self.base
+        rows = np.arange(len(self.ids), len(self.ids) + len(births), dtype=np.int64)
+        if len(offsets) and np.abs(offsets).max() >= 1 << (62 - ROW_BITS):
+            # Too far out for int64 keys; build them as Python ints instead
+            keys = sorted(offset << ROW_BITS | row
+                          for offset, row in zip(offsets.tolist(), rows.tolist()))
+        else:
+            keys = np.sort((offsets << ROW_BITS) | rows).tolist()
+        self.ids.extend(ids.tolist() if isinstance(ids, np.ndarray) else ids)
+        self.births.frombytes(births.astype(np.int64).tobytes())
+        self.active += len(births)
+        if self.heap:
+            self.heap.extend(keys)
+            heapq.heapify(self.heap)
+        else:
+            # A sorted list is already a valid heap
+            self.heap = keys
+        return first
+
+    def remove(self, handle):
+        """Stop tracking the person ``add`` returned ``handle`` for"""
+        row = handle
+        if self.handles is not None:
+            row = bisect_left(self.handles, handle)
+            if row == len(self.handles) or self.handles[row] != handle:
+                return
+        if self.births[row] != REMOVED:
+            self.births[row] = REMOVED
+            self.active -= 1
+            if len(self.ids) - self.active > len(self.ids) * COMPACT_FRACTION:
+                self.compact()
+
+    def compact(self):
+        """Drop removed rows from ``ids``, ``births`` and the heap"""
+        births = np.frombuffer(self.births, dtype=np.int64)
+        live = np.flatnonzero(births != REMOVED)
+        new_rows = np.full(len(births), -1, dtype=np.int64)
+        new_rows[live] = np.arange(len(live))
+        new_rows = new_rows.tolist()
+        mask = (1 << ROW_BITS) - 1
+        self.heap = [key >> ROW_BITS << ROW_BITS | new_rows[key & mask]
+                     for key in self.heap if new_rows[key & mask] >= 0]
+        heapq.heapify(self.heap)
+        handles = (np.arange(len(births), dtype=np.int64) if self.handles is None
+                   else np.frombuffer(self.handles, dtype=np.int64))
+        self.handles = array('q', handles[live].tobytes())
+        self.births = array('q', births[live].tobytes())
+        self.ids = [self.ids[row] for row in live.tolist()]
+
+    def _drop_removed(self):
+        mask = (1 << ROW_BITS) - 1
+        while self.heap and self.births[self.heap[0] & mask] == REMOVED:
+            heapq.heappop(self.heap)
+
+    def next_due(self):
+        """When the earliest pending milestone is due, or None"""
+        self._drop_removed()
+        if not self.heap:
+            return None
+        return np.datetime64((self.heap[0] >> ROW_BITS) + self.base, 's')
+
+    def _events(self, row, due):
+        birth = self.births[row]
+        elapsed = due - birth
+        at = np.datetime64(due, 's')
+        return [MilestoneEvent(self.ids[row], rule, elapsed // rule.unit_seconds, at)
+                for rule in self.rules if elapsed > 0 and elapsed % rule.period == 0]
+
+    def pop_due(self, now):
+        """Return the events due at or before ``now`` and schedule what follows"""
+        now = int(_seconds(now))
+        mask = (1 << ROW_BITS) - 1
+        events = []
+        while True:
+            self._drop_removed()
+            if not self.heap or (self.heap[0] >> ROW_BITS) + self.base > now:
+                return events
+            key = self.heap[0]
+            due, row = (key >> ROW_BITS) + self.base, key & mask
+            events.extend(self._events(row, due))
+            heapq.heapreplace(self.heap, self._key(self._next_after(self.births[row], due), row))
+
+    def upcoming(self, count):
+        """Events of the next ``count`` pending milestones, without popping them"""
+        mask = (1 << ROW_BITS) - 1
+        heap = self.heap
+        # Walk the heap tree smallest-first, visiting only the top entries
+        keys, frontier = [], [(heap[0], 0)] if heap else []
+        while frontier and len(keys) < count:
+            key, index = heapq.heappop(frontier)
+            if self.births[key & mask] != REMOVED:
+                keys.append(key)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return [event for key in keys
+                for event in self._events(key & mask, (key >> ROW_BITS) + self.base)]
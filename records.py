@@ -0,0 +1,118 @@
+"""Compact fixed-width binary format for birth records.
+
+An ``.agerec`` file is a 16-byte header followed by packed little-endian
+records of ``RECORD_DTYPE``: an int64 id and the birth datetime as int64
+seconds since the Unix epoch.  ``open_records`` memory-maps the records,
+so the age engine and birthday index can read a roster that does not fit
+in RAM without parsing or copying it.
+
+Header layout: 8-byte magic ``AGEREC01`` then the record count as uint64.
+"""
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'AGEREC01'
+HEADER = struct.Struct('<8sQ')
+HEADER_SIZE = HEADER.size
+RECORD_DTYPE = np.dtype([('id', '<i8'), ('birth', '<i8')])
+EXTENSION = '.agerec'
+
+
+def is_records(path):
+    return os.path.splitext(path)[1].lower() == EXTENSION
+
+
+class RecordWriter:
+    """Append records to a new ``.agerec`` file; the count is fixed up on close"""
+
+    def __init__(self, path):
+        self.handle = open(path, 'wb')
+        self.count = 0
+        self.handle.write(HEADER.pack(MAGIC, 0))
+
+    def write(self, ids, births):
+        births = np.asarray(births, dtype='datetime64[s]')
+        block = np.empty(len(births), dtype=RECORD_DTYPE)
+        block['id'] = ids
+        block['birth'] = births.astype(np.int64)
+        self.handle.write(block.tobytes())
+        self.count += len(block)
+
+    def close(self):
+        if self.handle.closed:
+            return
+        self.handle.seek(0)
+        self.handle.write(HEADER.pack(MAGIC, self.count))
+        self.handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_records(path, ids, births):
+    with RecordWriter(path) as writer:
+        writer.write(ids, births)
+        return writer.count
+
+
+def _int_ids(ids):
+    try:
+        return np.array(ids, dtype=np.int64)
+    except (TypeError, ValueError):
+        raise ValueError("binary records need integer ids") from None
+
+
+def _check_unzoned(ids, zones):
+    if zones is None:
+        return
+    for person_id, birth_tz, tz in zip(ids, zones.birth_tz, zones.tz):
+        if birth_tz or tz:
+            raise ValueError(f"row with id {person_id} has a time zone; binary records "
+                             f"can't store zones, so keep zoned rosters as CSV or JSONL")
+
+
+def convert(input_path, output_path, chunk_size=None):
+    """Convert a CSV/JSONL roster (see ``batch``) to ``.agerec``; returns the count.
+
+    Rows naming a ``birth_tz`` or ``tz`` are refused, as the format has
+    no room for zones.
+    """
+    import batch
+
+    chunk_size = chunk_size or batch.DEFAULT_CHUNK_SIZE
+    with open(input_path, newline='', encoding='utf-8') as src, \
+            RecordWriter(output_path) as writer:
+        for ids, births, zones in batch.iter_chunks(src, chunk_size, batch.is_jsonl(input_path)):
+            _check_unzoned(ids, zones)
+            writer.write(_int_ids(ids), births)
+        return writer.count
+
+
+def open_records(path, mode='r'):
+    """Memory-map an ``.agerec`` file as a structured array of RECORD_DTYPE"""
+    with open(path, 'rb') as handle:
+        magic, count = HEADER.unpack(handle.read(HEADER_SIZE))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an {EXTENSION} file")
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode=mode,
+                     offset=HEADER_SIZE, shape=(count,))
+
+
+def birth_datetimes(records):
+    """Zero-copy datetime64[s] view of the birth column"""
+    return records['birth'].view('datetime64[s]')
+
+
+def iter_chunks(records, chunk_size, start=0, stop=None):
+    """Yield (ids, births, None) slices of ``records`` like ``batch.iter_chunks``"""
+    stop = len(records) if stop is None else stop
+    for lo in range(start, stop, chunk_size):
+        block = records[lo:min(lo + chunk_size, stop)]
+        yield block['id'], birth_datetimes(block), None
@@ -0,0 +1,241 @@
+"""Single-pass aggregate statistics over a roster.
+
+``AgeStats`` is a fixed-size sketch: histograms of completed years and of
+exact age in whole days, birthday counts per month and per day of the
+year, and exact count/sum/min/max.  Its memory does not depend on the
+number of people, chunks are folded in as they are read, and two sketches
+merge by adding their counters, so sharded runs (or runs over several
+files) combine into exactly the result of one run over everything.
+
+Percentiles come from the day histogram, so they are exact to the day;
+the mean is exact.  Days of the year are numbered as in a leap year, so
+February 29th has a slot of its own.
+"""
+import datetime
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+import batch
+import timezones
+from age_engine import compute_ages, compute_zoned_ages, reference_time, to_datetime64
+from calendar_tables import CUMULATIVE_DAYS, split_days, to_days
+
+MAX_AGE_YEARS = 150
+MAX_AGE_DAYS = 55_000
+DAYS_PER_YEAR = 365.2425
+PERCENTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+MONTH_NAMES = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+class AgeStats:
+    """Mergeable age and birthday summary of any number of people.
+
+    ``years[i]`` counts people aged ``i`` completed years (the last bin is
+    ``MAX_AGE_YEARS`` and older), ``age_days`` likewise by age in whole
+    days.  People born after the reference time are only counted in
+    ``future`` and in the birthday counts.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.future = 0
+        # Python ints, so sums over any roster size stay exact
+        self.total_seconds = 0
+        self.min_seconds = None
+        self.max_seconds = None
+        self.years = np.zeros(MAX_AGE_YEARS + 1, dtype=np.int64)
+        self.age_days = np.zeros(MAX_AGE_DAYS + 1, dtype=np.int64)
+        self.months = np.zeros(12, dtype=np.int64)
+        self.day_of_year = np.zeros(366, dtype=np.int64)
+
+    @property
+    def rows(self):
+        return self.count + self.future
+
+    def add(self, births, now=None, zones=None, birth_tz=None, tz=None):
+        """Fold in one chunk of births, with the zone handling of ``batch``"""
+        births = to_datetime64(births)
+        resolved = batch.resolve_zones(zones, birth_tz, tz)
+        if resolved is None:
+            now = reference_time(now)
+            ages = compute_ages(births, now)
+            lived = (now - births).astype(np.int64)
+        else:
+            birth_zones, ref_zones = resolved
+            now_utc = batch.reference_time_utc(now)
+            ages = compute_zoned_ages(births, birth_zones, now_utc, ref_zones)
+            lived = (now_utc - timezones.to_utc(births, birth_zones)).astype(np.int64)
+        self.add_ages(births, ages.years, lived)
+        return self
+
+    def add_ages(self, births, years, lived):
+        """Fold in births with their completed years and seconds lived"""
+        _, month, day = split_days(to_days(births))
+        self.months += np.bincount(month - 1, minlength=12)
+        self.day_of_year += np.bincount(CUMULATIVE_DAYS[1, month - 1] + day - 1, minlength=366)
+
+        born = lived >= 0
+        lived, years = lived[born], np.asarray(years)[born]
+        self.future += len(born) - len(lived)
+        if not len(lived):
+            return
+        self.count += len(lived)
+        self.total_seconds += int(lived.sum())
+        low, high = int(lived.min()), int(lived.max())
+        self.min_seconds = low if self.min_seconds is None else min(self.min_seconds, low)
+        self.max_seconds = high if self.max_seconds is None else max(self.max_seconds, high)
+        self.years += np.bincount(np.minimum(years, MAX_AGE_YEARS), minlength=MAX_AGE_YEARS + 1)
+        self.age_days += np.bincount(np.minimum(lived // 86400, MAX_AGE_DAYS),
+                                     minlength=MAX_AGE_DAYS + 1)
+
+    def merge(self, other):
+        """Add ``other``'s counts to this sketch; returns self"""
+        self.count += other.count
+        self.future += other.future
+        self.total_seconds += other.total_seconds
+        for name in ('min_seconds', 'max_seconds'):
+            values = [v for v in (getattr(self, name), getattr(other, name)) if v is not None]
+            if values:
+                setattr(self, name, (min if name == 'min_seconds' else max)(values))
+        self.years += other.years
+        self.age_days += other.age_days
+        self.months += other.months
+        self.day_of_year += other.day_of_year
+        return self
+
+    def mean_years(self):
+        if not self.count:
+            return None
+        return self.total_seconds / self.count / 86400 / DAYS_PER_YEAR
+
+    def percentile(self, fraction):
+        """Age in years (day resolution) that ``fraction`` of people are at most"""
+        if not self.count:
+            return None
+        rank = max(1, int(np.ceil(fraction * self.count)))
+        day = int(np.searchsorted(np.cumsum(self.age_days), rank))
+        if day >= MAX_AGE_DAYS:
+            return self.max_seconds / 86400 / DAYS_PER_YEAR
+        return day / DAYS_PER_YEAR
+
+    def median(self):
+        return self.percentile(0.5)
+
+    def summary(self):
+        """Headline numbers as a plain dict"""
+        def years(seconds):
+            return None if seconds is None else seconds / 86400 / DAYS_PER_YEAR
+
+        return {
+            'count': self.count,
+            'future': self.future,
+            'mean_years': self.mean_years(),
+            'min_years': years(self.min_seconds),
+            'max_years': years(self.max_seconds),
+            'percentiles': {f'p{round(q * 100)}': self.percentile(q) for q in PERCENTILES},
+        }
+
+    def to_dict(self):
+        """JSON-serialisable state; ``from_dict`` restores it for merging"""
+        nonzero = np.flatnonzero(self.age_days)
+        return {
+            'count': self.count,
+            'future': self.future,
+            'total_seconds': self.total_seconds,
+            'min_seconds': self.min_seconds,
+            'max_seconds': self.max_seconds,
+            'years': self.years.tolist(),
+            # Sparse: most of the day bins of a real roster are empty
+            'age_days': [nonzero.tolist(), self.age_days[nonzero].tolist()],
+            'months': self.months.tolist(),
+            'day_of_year': self.day_of_year.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        for name in ('count', 'future', 'total_seconds', 'min_seconds', 'max_seconds'):
+            setattr(stats, name, state[name])
+        for name in ('years', 'months', 'day_of_year'):
+            getattr(stats, name)[:] = state[name]
+        index, counts = state['age_days']
+        stats.age_days[index] = counts
+        return stats
+
+    def report(self):
+        """Multi-line text report"""
+        if not self.rows:
+            return "No rows"
+        summary = self.summary()
+        lines = [f"People: {self.count:,}"
+                 + (f" (plus {self.future:,} born after the reference time)" if self.future else "")]
+        if self.count:
+            lines.append(f"Mean age: {summary['mean_years']:.2f} years "
+                         f"(min {summary['min_years']:.2f}, max {summary['max_years']:.2f})")
+            lines.append("Percentiles: " + ", ".join(
+                f"{name} {value:.2f}" for name, value in summary['percentiles'].items()))
+            lines.append("")
+            lines.append("Age (years)   People")
+            for start, count in binned_counts(self.years):
+                label = f"{start}+" if start + 10 > MAX_AGE_YEARS else f"{start}-{start + 9}"
+                lines.append(f"{label:<12}{count:>9,}")
+        lines.append("")
+        lines.append("Birthdays per month: " + ", ".join(
+            f"{name} {count:,}" for name, count in zip(MONTH_NAMES, self.months.tolist())))
+        busiest = int(np.argmax(self.day_of_year))
+        lines.append(f"Busiest birthday: {day_label(busiest)} "
+                     f"({int(self.day_of_year[busiest]):,} people)")
+        return "\n".join(lines)
+
+
+def binned_counts(years, width=10):
+    """(first age, count) per ``width``-year bin, without empty trailing bins"""
+    counts = np.add.reduceat(years, np.arange(0, len(years), width))
+    last = np.flatnonzero(counts)
+    counts = counts[:last[-1] + 1] if len(last) else counts[:0]
+    return [(i * width, int(count)) for i, count in enumerate(counts)]
+
+
+def day_label(index):
+    """'Feb 29' style label for a leap-year day-of-year index (0-based)"""
+    month = int(np.searchsorted(CUMULATIVE_DAYS[1], index, 'right'))
+    return f"{MONTH_NAMES[month - 1]} {index - int(CUMULATIVE_DAYS[1, month - 1]) + 1}"
+
+
+def _collect_shard(path, shard, chunk_size, now, birth_tz, tz):
+    stats = AgeStats()
+    for _, births, zones in batch.shard_chunks(path, shard, chunk_size):
+        stats.add(births, now, zones, birth_tz, tz)
+    return stats
+
+
+def collect(path, now=None, chunk_size=batch.DEFAULT_CHUNK_SIZE, workers=1,
+            birth_tz=None, tz=None):
+    """``AgeStats`` of a roster file, streamed chunk by chunk.
+
+    With ``workers`` > 1 the file is split like ``batch.run_sharded`` and
+    the per-shard sketches are merged.  A ``.json`` path is read as saved
+    ``AgeStats.to_dict`` output instead.
+    """
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as handle:
+            return AgeStats.from_dict(json.load(handle))
+    if now is None:
+        now = datetime.datetime.now()
+    workers = workers or os.cpu_count() or 1
+    stats = AgeStats()
+    if workers <= 1:
+        for _, births, zones in batch.read_chunks(path, chunk_size):
+            stats.add(births, now, zones, birth_tz, tz)
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = batch.plan_shards(path, workers, pool)
+        for part in pool.map(_collect_shard, repeat(path), shards, repeat(chunk_size),
+                             repeat(now), repeat(birth_tz), repeat(tz)):
+            stats.merge(part)
+    return stats
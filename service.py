@@ -0,0 +1,402 @@
+"""Local HTTP/JSON service for age queries.
+
+    python main.py --serve 8080 --roster roster.csv
+
+Every endpoint takes query parameters, a JSON object body, or both:
+
+    /age            birth [birth_tz, tz, now]       one age breakdown
+    /next-birthday  birth [birth_tz, tz, now]       next birthday and days to it
+    /ages           births [ids, birth_tz, tz, now] many breakdowns at once
+    /upcoming       [days, today] over the --roster, or births/ids in the body
+    /stats          per-endpoint latency histograms and batching counters
+
+Field meanings follow ``--batch`` (see ``batch``).  Concurrent single
+queries are not computed one by one: ``RequestBatcher`` queues them until
+the event loop's next iteration (or ``max_delay_ms``) and pushes the whole
+queue through ``batch.process_chunk`` in one go.  Only asyncio from the
+standard library is used, and the server binds to localhost by default.
+"""
+import asyncio
+import bisect
+import datetime
+import json
+import time
+from contextlib import suppress
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+import batch
+import records
+import timezones
+from birthday_index import BirthdayIndex
+from calendar_tables import DEFAULT_YEAR_RANGE, out_of_range
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+MAX_BATCH = 512
+MAX_DELAY_MS = 0
+MAX_BODY_BYTES = 64 << 20
+MAX_UPCOMING_DAYS = 366
+# Upper bounds of the latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large',
+}
+AGE_FIELDS = batch.OUTPUT_FIELDS[1:]
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyHistogram:
+    """Request latencies in fixed buckets, with bucket-resolution percentiles"""
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket the ``fraction`` quantile falls in"""
+        if not self.total:
+            return None
+        rank, seen = fraction * self.total, 0
+        for bound, count in zip(self.bounds + (self.max_ms,), self.counts):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def snapshot(self):
+        buckets = {f'<={bound}ms': count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f'>{self.bounds[-1]}ms'] = self.counts[-1]
+        return {
+            'count': self.total,
+            'mean_ms': round(self.sum_ms / self.total, 3) if self.total else None,
+            'p50_ms': self.percentile(0.5),
+            'p90_ms': self.percentile(0.9),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': buckets,
+        }
+
+
+def parse_now(value):
+    if value in (None, ''):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"invalid 'now' {value!r}") from None
+
+
+def parse_zone(value):
+    if value in (None, ''):
+        return ''
+    timezones.get_zone(value)
+    return value
+
+
+def parse_birth(value):
+    try:
+        birth = np.datetime64(value, 's')
+    except (TypeError, ValueError):
+        raise HttpError(400, f"invalid birth datetime {value!r}") from None
+    if out_of_range(birth):
+        first, last = DEFAULT_YEAR_RANGE
+        raise HttpError(400, f"birth {value!r} is outside the years {first}-{last}")
+    return birth
+
+
+def reference_date(now, zoned, tz):
+    """The date "today" is for a query, matching ``batch.process_chunk``"""
+    if not zoned:
+        return now.date()
+    zone = timezones.get_zone(tz or 'UTC')
+    return now.astimezone(zone).date()
+
+
+class RequestBatcher:
+    """Collects single age queries and computes them together.
+
+    ``submit`` queues one query and waits for its row.  The queue is
+    flushed on the event loop's next iteration, after ``max_delay_ms`` if
+    that is set, or as soon as ``max_batch`` queries are waiting.
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, max_delay_ms=MAX_DELAY_MS):
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_ms / 1000
+        self.pending = []
+        self.flush_handle = None
+        self.batches = 0
+        self.queries = 0
+
+    async def submit(self, birth, birth_tz='', tz='', now=None):
+        """Return (row, now) where ``row`` is a ``batch.OUTPUT_FIELDS`` tuple"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((birth, birth_tz, tz, now, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.flush_handle is None:
+            if self.max_delay:
+                self.flush_handle = loop.call_later(self.max_delay, self.flush)
+            else:
+                self.flush_handle = loop.call_soon(self.flush)
+        return await future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        queue, self.pending = self.pending, []
+        if not queue:
+            return
+        shared_now = datetime.datetime.now()
+        groups = {}
+        for item in queue:
+            groups.setdefault(item[3] or shared_now, []).append(item)
+        for now, items in groups.items():
+            try:
+                rows = self.compute(items, now)
+            except Exception:
+                # One bad query must not fail the others: retry them one by one
+                self.run_singly(items, now)
+                continue
+            for item, row in zip(items, rows):
+                if not item[4].done():
+                    item[4].set_result((row, now))
+        self.batches += len(groups)
+        self.queries += len(queue)
+
+    @staticmethod
+    def compute(items, now):
+        births = np.array([item[0] for item in items], dtype='datetime64[s]')
+        zones = None
+        if any(item[1] or item[2] for item in items):
+            zones = batch.Zones([item[1] for item in items], [item[2] for item in items])
+        return batch.process_chunk(range(len(items)), births, now, zones)
+
+    def run_singly(self, items, now):
+        for item in items:
+            future = item[4]
+            if future.done():
+                continue
+            try:
+                row, = self.compute([item], now)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result((row, now))
+
+
+class AgeService:
+    def __init__(self, index=None, batcher=None):
+        self.index = index
+        self.batcher = batcher or RequestBatcher()
+        self.latency = {}
+        self.routes = {
+            '/age': self.age,
+            '/next-birthday': self.next_birthday,
+            '/ages': self.ages,
+            '/upcoming': self.upcoming,
+            '/stats': self.stats,
+        }
+
+    async def _single(self, params):
+        if 'birth' not in params:
+            raise HttpError(400, "missing 'birth'")
+        birth = parse_birth(params['birth'])
+        birth_tz, tz = parse_zone(params.get('birth_tz')), parse_zone(params.get('tz'))
+        row, now = await self.batcher.submit(birth, birth_tz, tz, parse_now(params.get('now')))
+        return row, now, bool(birth_tz or tz), tz
+
+    async def age(self, params):
+        row, _, _, _ = await self._single(params)
+        return dict(zip(AGE_FIELDS, row[1:]))
+
+    async def next_birthday(self, params):
+        row, now, zoned, tz = await self._single(params)
+        days = row[-1]
+        date = reference_date(now, zoned, tz) + datetime.timedelta(days=days)
+        return {'birth': row[1], 'next_birthday': date.isoformat(), 'days_to_birthday': days}
+
+    async def ages(self, params):
+        births = params.get('births')
+        if not isinstance(births, list):
+            raise HttpError(400, "'births' must be a list")
+        ids = params.get('ids', list(range(len(births))))
+        if len(ids) != len(births):
+            raise HttpError(400, "'ids' and 'births' differ in length")
+        try:
+            births = np.array(births, dtype='datetime64[s]')
+        except ValueError as e:
+            raise HttpError(400, f"invalid birth datetime: {e}") from None
+        birth_tz, tz = params.get('birth_tz'), params.get('tz')
+        zones = None
+        if isinstance(birth_tz, list) or isinstance(tz, list):
+            zones = batch.Zones(*([parse_zone(zone) for zone in column]
+                                  if isinstance(column, list)
+                                  else [parse_zone(column)] * len(births)
+                                  for column in (birth_tz, tz)))
+            birth_tz = tz = None
+        else:
+            birth_tz, tz = parse_zone(birth_tz) or None, parse_zone(tz) or None
+        now = parse_now(params.get('now')) or datetime.datetime.now()
+        # Large requests would stall every other connection if run on the loop
+        rows = await asyncio.get_running_loop().run_in_executor(
+            None, batch.process_chunk, ids, births, now, zones, birth_tz, tz)
+        return {'results': [dict(zip(batch.OUTPUT_FIELDS, row)) for row in rows]}
+
+    async def upcoming(self, params):
+        days = int(params.get('days', 7))
+        if not 1 <= days <= MAX_UPCOMING_DAYS:
+            raise HttpError(400, f"'days' must be between 1 and {MAX_UPCOMING_DAYS}")
+        today = params.get('today')
+        today = datetime.date.fromisoformat(today) if today else datetime.date.today()
+        index = self.index
+        if 'births' in params:
+            births = params['births']
+            index = BirthdayIndex.from_births(params.get('ids', list(range(len(births)))),
+                                              np.array(births, dtype='datetime64[s]'))
+        if index is None:
+            raise HttpError(400, "no roster loaded; start with --roster or send 'births'")
+        return {'results': [{'id': person_id, 'date': date.isoformat()}
+                            for date, person_id in index.upcoming(today, days)]}
+
+    async def stats(self, params):
+        batcher = self.batcher
+        return {
+            'endpoints': {path: histogram.snapshot()
+                          for path, histogram in sorted(self.latency.items())},
+            'batching': {
+                'batches': batcher.batches,
+                'queries': batcher.queries,
+                'mean_batch': round(batcher.queries / batcher.batches, 2) if batcher.batches else None,
+            },
+        }
+
+    async def dispatch(self, method, target, body):
+        """Return (status, payload, endpoint) for one request"""
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        route = self.routes.get(path)
+        if route is None:
+            return 404, {'error': f"no endpoint {path}"}, 'unknown'
+        if method not in ('GET', 'POST'):
+            return 405, {'error': f"{method} not allowed"}, path
+        params = dict(parse_qsl(url.query))
+        try:
+            if body:
+                data = json.loads(body)
+                if not isinstance(data, dict):
+                    raise HttpError(400, "body must be a JSON object")
+                params.update(data)
+            return 200, await route(params), path
+        except HttpError as e:
+            return e.status, {'error': str(e)}, path
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': str(e)}, path
+
+    def record(self, endpoint, ms):
+        histogram = self.latency.get(endpoint)
+        if histogram is None:
+            histogram = self.latency[endpoint] = LatencyHistogram()
+        histogram.record(ms)
+
+    async def serve_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = time.perf_counter()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    self.respond(writer, 400, {'error': "malformed request"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    self.respond(writer, 413, {'error': "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload, endpoint = await self.dispatch(method, target, body)
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+                self.respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                self.record(endpoint, (time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+
+def load_index(path):
+    """BirthdayIndex for a roster in any format ``batch`` reads"""
+    if records.is_records(path):
+        return BirthdayIndex.from_records(records.open_records(path))
+    ids, births = batch.load_roster(path)
+    return BirthdayIndex.from_births(ids, births)
+
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT, index=None,
+                       max_batch=MAX_BATCH, max_delay_ms=MAX_DELAY_MS):
+    """Start serving in the running loop; returns (service, asyncio server)"""
+    service = AgeService(index, RequestBatcher(max_batch, max_delay_ms))
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    return service, server
+
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT, roster_path=None,
+        max_batch=MAX_BATCH, max_delay_ms=MAX_DELAY_MS):
+    """Serve until interrupted"""
+    index = load_index(roster_path) if roster_path else None
+
+    async def main():
+        _, server = await start_server(host, port, index, max_batch, max_delay_ms)
+        address = server.sockets[0].getsockname()
+        print(f"Serving on http://{address[0]}:{address[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(main())
@@ -0,0 +1,149 @@
+"""Chart page for roster statistics from ``roster_stats``.
+
+Rosters are streamed into an ``AgeStats`` sketch (or taken from the births
+already loaded in the dashboard), and the page draws its histograms as
+plain QPainter bar charts, so no charting module is needed.
+"""
+import datetime
+import os
+
+import numpy as np
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QPainter
+from PyQt6.QtWidgets import (QFileDialog, QHBoxLayout, QLabel, QPushButton,
+                             QVBoxLayout, QWidget)
+
+import theme
+from calendar_tables import CUMULATIVE_DAYS
+from roster_stats import MAX_AGE_YEARS, MONTH_NAMES, AgeStats, binned_counts, collect
+
+BAR_COLOR = theme.ACCENTS['info']
+CHART_HEIGHT = 150
+LABEL_HEIGHT = 18
+TITLE_HEIGHT = 22
+
+
+class BarChart(QWidget):
+    """Titled bar chart; ``labels`` maps bar index to axis text"""
+
+    def __init__(self, title):
+        super().__init__()
+        self.title = title
+        self.values = np.zeros(0, dtype=np.int64)
+        self.labels = {}
+        self.bar_color = QColor(BAR_COLOR)
+        self.setMinimumHeight(CHART_HEIGHT)
+
+    def set_data(self, values, labels):
+        self.values = np.asarray(values)
+        self.labels = labels
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        text_color = QColor(theme.THEMES[theme.current_theme() or theme.DEFAULT_THEME]['text'])
+        painter.setPen(text_color)
+        painter.setFont(QFont('Segoe UI', 10, QFont.Weight.Bold))
+        width, height = self.width(), self.height()
+        painter.drawText(QRectF(0, 0, width, TITLE_HEIGHT), Qt.AlignmentFlag.AlignLeft, self.title)
+        count = len(self.values)
+        peak = int(self.values.max()) if count else 0
+        if not peak:
+            return
+        top, bottom = TITLE_HEIGHT, height - LABEL_HEIGHT
+        step = width / count
+        gap = 1 if step > 3 else 0
+        heights = self.values * ((bottom - top) / peak)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.bar_color)
+        for index, bar in enumerate(heights.tolist()):
+            if bar > 0:
+                painter.drawRect(QRectF(index * step, bottom - bar, max(step - gap, 1), bar))
+        painter.setPen(text_color)
+        painter.setFont(QFont('Segoe UI', 8))
+        for index, label in self.labels.items():
+            painter.drawText(QRectF(index * step, bottom, max(step, 40), LABEL_HEIGHT),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, label)
+
+
+class StatsPage(QWidget):
+    def __init__(self, on_back):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        title = QLabel("Roster Statistics")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setFont(QFont('Segoe UI', 24, QFont.Weight.Bold))
+        title.setProperty("role", "title")
+
+        self.summary_label = QLabel("Load a roster to see its age distribution")
+        self.summary_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.summary_label.setProperty("role", "subtitle")
+
+        self.age_chart = BarChart("People by age (years)")
+        self.month_chart = BarChart("Birthdays per month")
+        self.day_chart = BarChart("Birthdays per day of the year")
+
+        self.status_label = QLabel("No roster loaded")
+        self.status_label.setProperty("role", "subtitle")
+
+        nav_layout = QHBoxLayout()
+        back_btn = QPushButton("◀ Back")
+        back_btn.clicked.connect(on_back)
+        load_btn = QPushButton("📂 Load Roster")
+        load_btn.clicked.connect(self.choose_roster)
+        nav_layout.addWidget(back_btn)
+        nav_layout.addStretch()
+        nav_layout.addWidget(self.status_label)
+        nav_layout.addStretch()
+        nav_layout.addWidget(load_btn)
+
+        layout.addWidget(title)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.age_chart, 2)
+        layout.addWidget(self.month_chart, 1)
+        layout.addWidget(self.day_chart, 1)
+        layout.addLayout(nav_layout)
+
+    def choose_roster(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Roster", "", "Rosters (*.csv *.jsonl *.ndjson *.agerec);;Saved stats (*.json)")
+        if path:
+            self.load(path)
+
+    def load(self, path):
+        """Stream a roster file (or saved stats) into the charts"""
+        try:
+            stats = collect(path, datetime.datetime.now())
+        except (OSError, ValueError, KeyError) as e:
+            self.status_label.setText(f"Could not load roster: {e}")
+            return False
+        self.show_stats(stats, f"{os.path.basename(path)} · {stats.rows:,} people")
+        return True
+
+    def show_births(self, births, source=""):
+        self.show_stats(AgeStats().add(births, datetime.datetime.now()), source)
+
+    def show_stats(self, stats, source=""):
+        self.stats = stats
+        self.status_label.setText(source or f"{stats.rows:,} people")
+        summary = stats.summary()
+        if stats.count:
+            percentiles = summary['percentiles']
+            self.summary_label.setText(
+                f"Mean {summary['mean_years']:.1f} years · median {percentiles['p50']:.1f} · "
+                f"p10 {percentiles['p10']:.1f} · p90 {percentiles['p90']:.1f} · "
+                f"oldest {summary['max_years']:.1f}")
+        else:
+            self.summary_label.setText("Nobody in this roster is born yet")
+
+        bins = binned_counts(stats.years, 5)
+        self.age_chart.set_data(
+            [count for _, count in bins],
+            {i: (f"{start}+" if start + 5 > MAX_AGE_YEARS else str(start))
+             for i, (start, _) in enumerate(bins) if start % 10 == 0})
+        self.month_chart.set_data(stats.months, dict(enumerate(MONTH_NAMES)))
+        self.day_chart.set_data(
+            stats.day_of_year,
+            {int(CUMULATIVE_DAYS[1, month]): name for month, name in enumerate(MONTH_NAMES)})
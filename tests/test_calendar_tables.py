@@ -0,0 +1,189 @@
+"""Property checks of the calendar lookup tables against brute-force day counting.
+
+Random dates are drawn from seeded generators, plus fixed edge cases:
+February 29th under both ``feb29`` policies, month ends and the first
+and last days of the table range.
+"""
+import datetime
+
+import numpy as np
+import pytest
+
+import calendar_tables
+from calendar_tables import (DEFAULT_YEAR_RANGE, FEB29_POLICIES, month_steps, next_birthday,
+                             split_days, to_days, ymd_difference)
+
+EPOCH = datetime.date(1970, 1, 1)
+FIRST = datetime.date(DEFAULT_YEAR_RANGE[0], 1, 1)
+LAST = datetime.date(DEFAULT_YEAR_RANGE[1], 12, 31)
+SEEDS = range(5)
+SAMPLES = 300
+
+EDGE_DATES = [
+    FIRST, FIRST + datetime.timedelta(days=1), datetime.date(1, 2, 28), datetime.date(1, 12, 31),
+    LAST, LAST - datetime.timedelta(days=1), datetime.date(9999, 2, 28), datetime.date(9998, 12, 31),
+    datetime.date(1600, 2, 29), datetime.date(1700, 2, 28), datetime.date(1900, 3, 1),
+    datetime.date(2000, 2, 29), datetime.date(2024, 2, 29), datetime.date(2023, 1, 31),
+    datetime.date(2100, 2, 28), datetime.date(1969, 12, 31), EPOCH,
+]
+
+
+def day_number(date):
+    return (date - EPOCH).days
+
+
+def random_dates(seed, count=SAMPLES, first=FIRST, last=LAST):
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(0, (last - first).days + 1, count)
+    return [first + datetime.timedelta(days=int(offset)) for offset in offsets]
+
+
+def observed_birthday(birth, year, feb29):
+    """Brute force: the day ``birth``'s birthday is observed on in ``year``"""
+    try:
+        return datetime.date(year, birth.month, birth.day)
+    except ValueError:
+        # Only February 29th is missing from some years
+        return datetime.date(year, 2, 28) if feb29 == 'feb28' else datetime.date(year, 3, 1)
+
+
+def brute_next_birthday(birth, today, feb29):
+    """Walk forward one day at a time until a birthday is observed"""
+    day = today
+    while day != observed_birthday(birth, day.year, feb29):
+        day += datetime.timedelta(days=1)
+    return day
+
+
+def brute_month_date(birth, months, feb29):
+    """``birth`` moved by ``months``, counting days when the day is missing"""
+    year, month = divmod(birth.year * 12 + birth.month - 1 + months, 12)
+    day = datetime.date(year, month + 1, 1)
+    # Walk the month's days, stopping on the birth day or at the month end
+    while day.day < birth.day:
+        following = day + datetime.timedelta(days=1)
+        if following.month != day.month:
+            return day if feb29 == 'feb28' else following
+        day = following
+    return day
+
+
+def brute_month_steps(birth, now, feb29):
+    """Largest number of whole month steps from ``birth`` not after ``now``"""
+    steps = (now.year - birth.year) * 12 + now.month - birth.month
+    while True:
+        anniversary = datetime.datetime.combine(
+            brute_month_date(birth.date(), steps, feb29), birth.time())
+        if anniversary <= now:
+            return steps, anniversary
+        steps -= 1
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_split_days_matches_dates(seed):
+    dates = random_dates(seed) + EDGE_DATES
+    year, month, day = split_days(np.array([day_number(date) for date in dates]))
+    assert list(zip(year.tolist(), month.tolist(), day.tolist())) == \
+        [(date.year, date.month, date.day) for date in dates]
+
+
+def test_split_days_covers_every_day_of_a_leap_cycle():
+    first = datetime.date(1999, 12, 25)
+    dates = [first + datetime.timedelta(days=i) for i in range(4 * 366)]
+    year, month, day = split_days(np.arange(day_number(first), day_number(first) + len(dates)))
+    assert list(zip(year.tolist(), month.tolist(), day.tolist())) == \
+        [(date.year, date.month, date.day) for date in dates]
+
+
+def test_to_days_agrees_with_datetime64():
+    dates = EDGE_DATES
+    days = to_days(np.array([date.isoformat() for date in dates], dtype='datetime64[D]'))
+    assert days.tolist() == [day_number(date) for date in dates]
+
+
+def test_outside_the_range_is_rejected():
+    assert not calendar_tables.out_of_range(
+        np.array([FIRST.isoformat(), LAST.isoformat()], dtype='datetime64[s]')).any()
+    outside = np.array(['0000-12-31', '10000-01-01'], dtype='datetime64[s]')
+    assert calendar_tables.out_of_range(outside).all()
+    with pytest.raises(ValueError):
+        split_days(to_days(outside))
+
+
+@pytest.mark.parametrize('feb29', FEB29_POLICIES)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_next_birthday_matches_day_walk(seed, feb29):
+    births = random_dates(seed)
+    todays = random_dates(seed + 100, last=datetime.date(DEFAULT_YEAR_RANGE[1] - 1, 12, 31))
+    expected = [day_number(brute_next_birthday(birth, today, feb29))
+                for birth, today in zip(births, todays)]
+    result = next_birthday(np.array([day_number(d) for d in births]),
+                           np.array([day_number(d) for d in todays]), feb29)
+    assert result.tolist() == expected
+
+
+@pytest.mark.parametrize('feb29', FEB29_POLICIES)
+def test_next_birthday_of_feb29(feb29):
+    birth = datetime.date(2000, 2, 29)
+    todays = [datetime.date(year, 1, 1) + datetime.timedelta(days=offset)
+              for year in (1, 4, 1900, 2023, 2024, 2100, 9996, 9998) for offset in range(56, 62)]
+    for today in todays:
+        expected = brute_next_birthday(birth, today, feb29)
+        result = next_birthday(day_number(birth), day_number(today), feb29)
+        assert int(result) == day_number(expected), today
+    assert brute_next_birthday(birth, datetime.date(2023, 2, 28), feb29) == (
+        datetime.date(2023, 2, 28) if feb29 == 'feb28' else datetime.date(2023, 3, 1))
+
+
+def test_next_birthday_at_the_range_edges():
+    first = day_number(FIRST)
+    assert int(next_birthday(first, first)) == first
+    last = day_number(LAST)
+    assert int(next_birthday(last, last)) == last
+    # The following birthday would be in the year 10000
+    with pytest.raises(ValueError):
+        next_birthday(day_number(datetime.date(2000, 1, 1)), last)
+
+
+def random_datetimes(seed, count=SAMPLES):
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 86400, count)
+    return [datetime.datetime.combine(date, datetime.time()) + datetime.timedelta(seconds=int(s))
+            for date, s in zip(random_dates(seed, count), seconds.tolist())]
+
+
+@pytest.mark.parametrize('feb29', FEB29_POLICIES)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_month_steps_match_brute_force(seed, feb29):
+    births = random_datetimes(seed)
+    nows = random_datetimes(seed + 100)
+    pairs = [(min(a, b), max(a, b)) for a, b in zip(births, nows)]
+    for birth, now in pairs:
+        assert month_steps(birth, now, feb29) == brute_month_steps(birth, now, feb29)
+    years, months, anniversary = ymd_difference(
+        np.array([birth for birth, _ in pairs], dtype='datetime64[s]'),
+        np.array([now for _, now in pairs], dtype='datetime64[s]'), feb29)
+    expected = [brute_month_steps(birth, now, feb29) for birth, now in pairs]
+    assert (years * 12 + months).tolist() == [steps for steps, _ in expected]
+    assert anniversary.tolist() == [when for _, when in expected]
+
+
+@pytest.mark.parametrize('feb29', FEB29_POLICIES)
+def test_month_steps_from_feb29_and_month_ends(feb29):
+    births = [datetime.datetime(2000, 2, 29, 12), datetime.datetime(2024, 2, 29),
+              datetime.datetime(2023, 1, 31, 23, 59, 59), datetime.datetime(1, 1, 31),
+              datetime.datetime(9998, 12, 31, 6)]
+    for birth in births:
+        start = birth.date()
+        for offset in (0, 1, 27, 28, 29, 30, 31, 59, 60, 365, 366, 1461, 1462):
+            if offset > (LAST - start).days:
+                continue
+            for time in (datetime.time(), birth.time(), datetime.time(23, 59, 59)):
+                now = datetime.datetime.combine(start + datetime.timedelta(days=offset), time)
+                if now < birth:
+                    continue
+                assert month_steps(birth, now, feb29) == brute_month_steps(birth, now, feb29)
+                steps, anniversary = brute_month_steps(birth, now, feb29)
+                years, months, vector = ymd_difference(np.datetime64(birth, 's'),
+                                                       np.datetime64(now, 's'), feb29)
+                assert (int(years) * 12 + int(months), vector.item()) == (steps, anniversary)
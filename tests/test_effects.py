@@ -0,0 +1,90 @@
+"""Timer and particle bounds of the birthday celebration, run offscreen."""
+import datetime
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtCore = pytest.importorskip('PyQt6.QtCore')
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import effects  # noqa: E402
+from gui import PAGE_PICKER, PAGE_RESULT, PAGE_WELCOME, AgeCalculator  # noqa: E402
+
+UPDATES = 500
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    window = AgeCalculator(max_particles=200, warm_up=False, perf=False)
+    window.ensure_page(PAGE_PICKER)
+    window.ensure_page(PAGE_RESULT)
+    yield window
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def active_timers(window):
+    return sum(timer.isActive() for timer in window.findChildren(QtCore.QTimer))
+
+
+def set_birthday_today(window):
+    today = datetime.date.today()
+    years = 30
+    while True:
+        try:
+            birth = today.replace(year=today.year - years)
+            break
+        except ValueError:
+            # February 29th today; go back to the previous leap year
+            years += 1
+    window.calendar.setSelectedDate(QtCore.QDate(birth.year, birth.month, birth.day))
+    window.time_edit.setTime(QtCore.QTime(0, 0, 0))
+    window.reference_check.setChecked(False)
+
+
+def test_repeated_updates_keep_timers_and_particles_bounded(window, app):
+    timers = active_timers(window)
+    particles = window.confetti.active_count
+    set_birthday_today(window)
+    window.calculate_and_show_result()
+    assert window.celebration.active
+
+    # The tick timer, the repeat timer, the milestone timer and the frame timer
+    limit = timers + 3
+    for _ in range(UPDATES):
+        window.update_age()
+        app.processEvents()
+        assert active_timers(window) <= limit
+        assert window.confetti.active_count <= effects.INITIAL_BURST
+    # Repeat bursts are launched by the timer, never by update_age
+    assert window.confetti.active_count == effects.INITIAL_BURST
+    window.celebration.repeat_burst()
+    assert window.confetti.active_count <= window.confetti.max_particles
+
+    window.show_page(PAGE_WELCOME)
+    app.processEvents()
+    assert not window.celebration.active
+    assert active_timers(window) == timers
+    assert window.confetti.active_count == particles
+
+
+def test_celebration_restarts_after_returning(window, app):
+    timers = active_timers(window)
+    set_birthday_today(window)
+    for _ in range(3):
+        window.calculate_and_show_result()
+        for _ in range(50):
+            window.update_age()
+        assert window.celebration.active
+        assert window.confetti.active_count == effects.INITIAL_BURST
+        window.show_page(PAGE_WELCOME)
+        app.processEvents()
+        assert active_timers(window) == timers
+        assert window.confetti.active_count == 0
@@ -0,0 +1,42 @@
+"""PerfMonitor hooks are released when the window closes."""
+import json
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtCore = pytest.importorskip('PyQt6.QtCore')
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+
+from gui import AgeCalculator  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_closing_the_window_closes_the_monitor(app, tmp_path):
+    log_path = tmp_path / 'perf.jsonl'
+    window = AgeCalculator(warm_up=False, perf=True, perf_log=str(log_path))
+    perf = window.perf
+    log = perf.log
+    widget = QWidget()
+
+    polish_events = perf.polish_events
+    QApplication.sendEvent(widget, QtCore.QEvent(QtCore.QEvent.Type.PolishRequest))
+    assert perf.polish_events > polish_events
+    perf.sample()
+
+    window.close()
+    assert log.closed
+    assert perf.log is None
+    assert not perf.sample_timer.isActive()
+    # The app-wide filter no longer sees events
+    polish_events = perf.polish_events
+    QApplication.sendEvent(widget, QtCore.QEvent(QtCore.QEvent.Type.PolishRequest))
+    assert perf.polish_events == polish_events
+    snapshot = json.loads(log_path.read_text(encoding='utf-8').splitlines()[-1])
+    assert snapshot['polish_events'] >= 1
+    window.deleteLater()
+    app.processEvents()
@@ -0,0 +1,57 @@
+"""AgeTicker against age_breakdown, tick by tick, across DST month steps."""
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from age_engine import age_breakdown
+from ticker import AgeTicker
+
+BERLIN = ZoneInfo('Europe/Berlin')
+NEW_YORK = ZoneInfo('America/New_York')
+
+
+def ticks(start, hours, step_seconds=60):
+    utc = start.astimezone(datetime.timezone.utc)
+    for second in range(0, hours * 3600, step_seconds):
+        yield (utc + datetime.timedelta(seconds=second)).astimezone(start.tzinfo)
+
+
+@pytest.mark.parametrize('birth, start', [
+    # Fall back on 2024-10-27, month step on 2024-11-01 14:00
+    (datetime.datetime(1990, 10, 1, 14, 0, tzinfo=BERLIN),
+     datetime.datetime(2024, 10, 31, 12, 0, tzinfo=BERLIN)),
+    # Spring forward on 2024-03-31, month step on 2024-04-01 14:00
+    (datetime.datetime(1990, 3, 1, 14, 0, tzinfo=BERLIN),
+     datetime.datetime(2024, 3, 31, 12, 0, tzinfo=BERLIN)),
+    # Birth recorded in another zone; steps follow the reference zone's calendar
+    (datetime.datetime(1985, 10, 2, 3, 30, tzinfo=BERLIN),
+     datetime.datetime(2024, 11, 1, 0, 0, tzinfo=NEW_YORK)),
+    (datetime.datetime(1985, 2, 10, 2, 30, tzinfo=NEW_YORK),
+     datetime.datetime(2024, 3, 9, 0, 0, tzinfo=NEW_YORK)),
+])
+def test_tick_matches_age_breakdown_across_dst(birth, start):
+    ticker = AgeTicker(birth)
+    for now in ticks(start, 52):
+        _, age = ticker.tick(now)
+        assert age == age_breakdown(birth, now), now
+
+
+def test_month_step_is_shown_on_time():
+    birth = datetime.datetime(1990, 10, 1, 14, 0, tzinfo=BERLIN)
+    ticker = AgeTicker(birth)
+    ticker.tick(datetime.datetime(2024, 11, 1, 13, 59, 59, tzinfo=BERLIN))
+    _, age = ticker.tick(datetime.datetime(2024, 11, 1, 14, 0, 5, tzinfo=BERLIN))
+    assert tuple(age) == (34, 1, 0, 0, 0, 5)
+
+
+def test_naive_ticks_reuse_the_day_state():
+    birth = datetime.datetime(2000, 1, 31, 8, 30)
+    ticker = AgeTicker(birth)
+    start = datetime.datetime(2024, 2, 28, 12, 0)
+    for second in range(0, 3 * 86400, 30):
+        now = start + datetime.timedelta(seconds=second)
+        _, age = ticker.tick(now)
+        assert age == age_breakdown(birth, now), now
+    # One full update per date plus one per month or day step
+    assert ticker.full_updates < 10
@@ -0,0 +1,384 @@
+"""Application-wide theme: one precomputed stylesheet instead of per-widget ones.
+
+Widgets only set an object name or a ``role``/``accent`` dynamic property;
+all the styling lives in a single stylesheet installed on the QApplication,
+so Qt parses one sheet at startup instead of one per widget.  Stylesheets
+are built once per theme and color shades once per color, and both are
+cached.  ``install`` can be called again at any time to switch themes.
+"""
+import colorsys
+from functools import lru_cache
+from string import Template
+
+THEMES = {
+    'aurora': {
+        'gradient_start': '#4158D0',
+        'gradient_mid': '#C850C0',
+        'gradient_end': '#FFCC70',
+        'surface': 'rgba(32, 32, 32, 0.95)',
+        'surface_alt': 'rgba(45, 55, 72, 0.8)',
+        'border': 'rgba(255, 255, 255, 0.1)',
+        'text': 'white',
+        'text_muted': '#E2E8F0',
+        'result_text': 'palette(window-text)',
+        'indicator': '#718096',
+        'header': '#99A3A4',
+        'menu': '#202020',
+        'menu_border': '#404040',
+        'disabled': '#666666',
+        'selection': '#0078D4',
+        'celebration': '#FF4081',
+        'celebration_bg': 'rgba(255, 64, 129, 0.1)',
+    },
+    'midnight': {
+        'gradient_start': '#0F172A',
+        'gradient_mid': '#1E293B',
+        'gradient_end': '#334155',
+        'surface': 'rgba(15, 23, 42, 0.95)',
+        'surface_alt': 'rgba(51, 65, 85, 0.8)',
+        'border': 'rgba(148, 163, 184, 0.2)',
+        'text': '#F8FAFC',
+        'text_muted': '#CBD5E1',
+        'result_text': '#F8FAFC',
+        'indicator': '#94A3B8',
+        'header': '#94A3B8',
+        'menu': '#0F172A',
+        'menu_border': '#334155',
+        'disabled': '#475569',
+        'selection': '#6366F1',
+        'celebration': '#F472B6',
+        'celebration_bg': 'rgba(244, 114, 182, 0.1)',
+    },
+}
+DEFAULT_THEME = 'aurora'
+
+# Named button accents; ModernButton also accepts any hex color
+ACCENTS = {
+    'primary': '#8B5CF6',
+    'muted': '#64748B',
+    'success': '#48BB78',
+    'info': '#4299E1',
+}
+
+_custom_accents = {}
+_current = {'name': None, 'app': None}
+
+
+@lru_cache(maxsize=None)
+def shade(hex_color, factor):
+    """Darken (negative factor) or lighten a color by ``factor`` HSV value steps"""
+    hex_color = hex_color.lstrip('#')
+    r, g, b = (int(hex_color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    v = max(0.0, min(1.0, v + factor / 255))
+    r, g, b = colorsys.hsv_to_rgb(h, s, v)
+    return '#{:02x}{:02x}{:02x}'.format(*(round(c * 255) for c in (r, g, b)))
+
+
+_BASE = Template("""
+QMainWindow {
+    background: qlineargradient(
+        x1: 0, y1: 0, x2: 1, y2: 1,
+        stop: 0 $gradient_start,
+        stop: 0.46 $gradient_mid,
+        stop: 1 $gradient_end
+    );
+}
+#modernFrame {
+    background-color: $surface;
+    border-radius: 15px;
+    border: 1px solid $border;
+    padding: 20px;
+    margin: 10px;
+}
+QLabel[role="title"] {
+    color: $text;
+}
+QLabel[role="subtitle"] {
+    color: $text_muted;
+}
+QLabel#descLabel, QLabel#pickerTitle {
+    margin-bottom: 20px;
+}
+QLabel[role="pageIndicator"] {
+    color: $indicator;
+    font-size: 14px;
+    font-weight: bold;
+    background: rgba(255, 255, 255, 0.2);
+    padding: 5px 15px;
+    border-radius: 15px;
+}
+QLabel#resultPageIndicator {
+    color: $indicator;
+}
+QLabel#ageLabel, QLabel#nextBirthdayLabel, QLabel#milestoneLabel {
+    color: $result_text;
+}
+QLabel#timeLabel {
+    color: $text;
+    font-size: 16px;
+    font-weight: bold;
+    margin-right: 10px;
+}
+QLabel#previewLabel {
+    color: $text_muted;
+    font-size: 15px;
+}
+QLabel#detailedAgeLabel {
+    font-size: 16px;
+    color: $text;
+    padding: 20px;
+    background-color: $surface_alt;
+    border-radius: 10px;
+    margin: 10px;
+}
+QLabel#celebrationLabel {
+    color: $celebration;
+    font-size: 32px;
+    background-color: $celebration_bg;
+    padding: 20px;
+    border-radius: 15px;
+    border: 2px solid $celebration;
+}
+QPushButton#homeButton {
+    background-color: $success;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-size: 14px;
+}
+QPushButton#homeButton:hover {
+    background-color: $success_hover;
+}
+QCalendarWidget#birthCalendar {
+    background-color: transparent;
+}
+QCalendarWidget#birthCalendar QToolButton {
+    color: $text;
+    background-color: transparent;
+    padding: 10px;
+    border-radius: 5px;
+    font-weight: bold;
+    font-size: 14px;
+    min-width: 80px;
+}
+QCalendarWidget#birthCalendar QToolButton:hover {
+    background-color: rgba(255, 255, 255, 0.1);
+}
+QCalendarWidget#birthCalendar QMenu {
+    background-color: $menu;
+    border: 1px solid $menu_border;
+    border-radius: 5px;
+    color: $text;
+    padding: 4px;
+}
+QCalendarWidget#birthCalendar QSpinBox {
+    background-color: $menu;
+    color: $text;
+    border-radius: 5px;
+    padding: 5px;
+    selection-background-color: $selection;
+}
+QCalendarWidget#birthCalendar QTableView {
+    background-color: $surface;
+    selection-background-color: $selection;
+    selection-color: white;
+    color: $text;
+    border-radius: 8px;
+    padding: 5px;
+    font-size: 13px;
+}
+QCalendarWidget#birthCalendar QTableView QHeaderView {
+    background-color: transparent;
+}
+QCalendarWidget#birthCalendar QTableView QHeaderView::section {
+    color: $header;
+    padding: 6px;
+    font-size: 13px;
+}
+QCalendarWidget#birthCalendar QTableView QTableCornerButton::section {
+    background-color: transparent;
+    border: none;
+}
+QCalendarWidget#birthCalendar QAbstractItemView:enabled {
+    color: $text;
+    selection-background-color: $selection;
+    selection-color: white;
+    font-size: 13px;
+}
+QCalendarWidget#birthCalendar QAbstractItemView:disabled {
+    color: $disabled;
+}
+QCalendarWidget#birthCalendar QTableView QTableCornerButton::section:pressed {
+    background-color: $selection;
+}
+QTimeEdit#birthTimeEdit {
+    background-color: $surface;
+    color: $text;
+    padding: 5px 35px 5px 10px;
+    border-radius: 5px;
+    min-width: 200px;
+    font-size: 18px;
+    selection-background-color: $selection;
+    selection-color: white;
+    border: 1px solid $menu_border;
+}
+QCheckBox#referenceCheck {
+    color: $text;
+    font-size: 16px;
+    font-weight: bold;
+}
+QDateEdit#referenceDateEdit {
+    background-color: $surface;
+    color: $text;
+    padding: 5px 10px;
+    border-radius: 5px;
+    min-width: 200px;
+    font-size: 16px;
+    selection-background-color: $selection;
+}
+QDateEdit#referenceDateEdit:disabled {
+    color: $disabled;
+}
+QTimeEdit#birthTimeEdit::section {
+    background-color: transparent;
+    color: $text;
+    min-width: 40px;
+}
+QTimeEdit#birthTimeEdit::up-button {
+    subcontrol-origin: padding;
+    subcontrol-position: right;
+    right: 0px;
+    top: 0px;
+    background-color: transparent;
+    width: 20px;
+    height: 20px;
+    border: none;
+}
+QTimeEdit#birthTimeEdit::down-button {
+    subcontrol-origin: padding;
+    subcontrol-position: right;
+    right: 0px;
+    bottom: 0px;
+    background-color: transparent;
+    width: 20px;
+    height: 20px;
+    border: none;
+}
+QTimeEdit#birthTimeEdit::up-button:hover, QTimeEdit#birthTimeEdit::down-button:hover {
+    background-color: rgba(255, 255, 255, 0.1);
+}
+QComboBox#birthZoneCombo {
+    background-color: $surface;
+    color: $text;
+    padding: 5px 10px;
+    border-radius: 5px;
+    min-width: 200px;
+    font-size: 14px;
+    border: 1px solid $menu_border;
+}
+QComboBox#birthZoneCombo QAbstractItemView {
+    background-color: $menu;
+    color: $text;
+    selection-background-color: $selection;
+}
+QTableView#dashboardTable {
+    background-color: $surface;
+    alternate-background-color: $surface_alt;
+    color: $text;
+    border-radius: 10px;
+    font-size: 14px;
+}
+QTableView#dashboardTable QHeaderView::section {
+    background-color: $menu;
+    color: $header;
+    padding: 6px;
+    border: none;
+    font-weight: bold;
+}
+QLabel#perfOverlay {
+    background-color: rgba(0, 0, 0, 170);
+    color: #E2E8F0;
+    font-family: monospace;
+    font-size: 11px;
+    padding: 6px 8px;
+    border-radius: 6px;
+}
+""")
+
+_ACCENT = Template("""
+QPushButton[accent="$key"] {
+    background-color: $color;
+    color: white;
+    border: 2px solid $color;
+    padding: 12px 25px;
+    border-radius: 8px;
+    font-size: 14px;
+    font-weight: bold;
+}
+QPushButton[accent="$key"]:hover {
+    background-color: $hover;
+    border-color: $hover;
+}
+QPushButton[accent="$key"]:pressed {
+    background-color: $pressed;
+    border-color: $pressed;
+}
+""")
+
+
+@lru_cache(maxsize=None)
+def accent_rules(key, color):
+    return _ACCENT.substitute(key=key, color=color,
+                              hover=shade(color, -20), pressed=shade(color, -40))
+
+
+@lru_cache(maxsize=None)
+def _build(name, custom):
+    colors = dict(THEMES[name], success=ACCENTS['success'],
+                  success_hover=shade(ACCENTS['success'], -20))
+    parts = [_BASE.substitute(colors)]
+    parts += [accent_rules(key, color) for key, color in ACCENTS.items()]
+    parts += [accent_rules(key, color) for key, color in custom]
+    return ''.join(parts)
+
+
+def build_stylesheet(name=DEFAULT_THEME):
+    """The full application stylesheet for theme ``name`` (cached)"""
+    if name not in THEMES:
+        raise ValueError(f"unknown theme {name!r}, choose from {', '.join(THEMES)}")
+    return _build(name, tuple(sorted(_custom_accents.items())))
+
+
+def accent_key(accent):
+    """Property value for a named accent or an arbitrary hex color"""
+    if accent in ACCENTS:
+        return accent
+    key = 'c' + accent.lstrip('#').lower()
+    if key not in _custom_accents:
+        _custom_accents[key] = accent
+        if _current['app'] is not None:
+            install(_current['app'], _current['name'])
+    return key
+
+
+def current_theme():
+    return _current['name']
+
+
+def install(app, name=DEFAULT_THEME):
+    """Install (or switch to) theme ``name`` on ``app``"""
+    stylesheet = build_stylesheet(name)
+    _current.update(name=name, app=app)
+    app.setStyleSheet(stylesheet)
+
+
+def ensure_installed(app, name=DEFAULT_THEME):
+    if _current['app'] is not app:
+        install(app, name)
+
+
+def next_theme(name):
+    names = list(THEMES)
+    return names[(names.index(name) + 1) % len(names)]
@@ -0,0 +1,133 @@
+"""Incremental per-second age updates for the live result page."""
+import datetime
+from collections import OrderedDict
+from typing import NamedTuple
+
+import calendar_tables
+from age_engine import AgeBreakdown, age_anchor, age_breakdown, elapsed
+
+PREVIEW_CACHE_SIZE = 256
+
+
+class DayState(NamedTuple):
+    years: int
+    months: int
+    days: int
+    is_birthday: bool
+    next_birthday: datetime.date
+    days_to_birthday: int
+    # When the current years/months were completed; days count from here
+    anniversary: datetime.datetime
+    # The next month step, at the birth's wall-clock time
+    next_anniversary: datetime.datetime
+
+
+class AgeTicker:
+    """Keeps the calendar part of one person's age between ticks.
+
+    Years, months, days and the next birthday only change when the current
+    date changes, when the time since the last month step rolls over to
+    another whole day, or when the next month step is reached (across a
+    DST change that is not on a whole day of elapsed time), so they are
+    recomputed only then.  Every other tick just splits the elapsed
+    seconds into hours, minutes and seconds.
+    """
+
+    def __init__(self, birth_datetime, feb29='mar1'):
+        calendar_tables.check_policy(feb29)
+        self.birth_datetime = birth_datetime
+        self.feb29 = feb29
+        self.state = None
+        self.state_date = None
+        self.full_updates = 0
+
+    def day_state(self, current_date):
+        years, months, anniversary = age_anchor(self.birth_datetime, current_date, self.feb29)
+        days = elapsed(current_date, anniversary).days
+        birth = self.birth_datetime
+        if birth.tzinfo is not None and current_date.tzinfo is not None:
+            birth = birth.astimezone(current_date.tzinfo)
+        next_anniversary = datetime.datetime.combine(
+            calendar_tables.shift_date(birth.date(), years * 12 + months + 1, self.feb29),
+            birth.time(), tzinfo=anniversary.tzinfo)
+        today = current_date.date()
+        birth_day = calendar_tables.to_days(self.birth_datetime.date())
+        today_day = calendar_tables.to_days(today)
+        next_day = int(calendar_tables.next_birthday(birth_day, today_day, self.feb29))
+        days_to_birthday = next_day - int(today_day)
+        next_birthday = today + datetime.timedelta(days=days_to_birthday)
+        return DayState(years, months, days, days_to_birthday == 0,
+                        next_birthday, days_to_birthday, anniversary, next_anniversary)
+
+    def tick(self, current_date):
+        """Return (state, age) for ``current_date``, ``age`` an ``AgeBreakdown``"""
+        state = self.state
+        delta = None
+        # Same-zone aware datetimes compare by wall time, like the month steps
+        if (state is not None and current_date.date() == self.state_date
+                and current_date < state.next_anniversary):
+            delta = elapsed(current_date, state.anniversary)
+        if delta is None or delta.days != state.days:
+            state = self.state = self.day_state(current_date)
+            self.state_date = current_date.date()
+            self.full_updates += 1
+            delta = elapsed(current_date, state.anniversary)
+        seconds = delta.seconds
+        return state, AgeBreakdown(state.years, state.months, state.days,
+                                   seconds // 3600, (seconds % 3600) // 60, seconds % 60)
+
+
+class CalendarCache:
+    """Whole-month steps per (birth date, reference date), shared by all birth times.
+
+    The latest month step whose date is on or before the reference date
+    doesn't depend on the time of birth, so changing only the time reuses
+    it and just measures the time since that step.  The time matters only
+    when the step falls on the reference date itself and is still ahead;
+    that case falls back to ``age_breakdown``.  Least recently used
+    entries are dropped beyond ``maxsize``.
+    """
+
+    def __init__(self, maxsize=PREVIEW_CACHE_SIZE, feb29='mar1'):
+        calendar_tables.check_policy(feb29)
+        self.maxsize = maxsize
+        self.feb29 = feb29
+        self.steps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def breakdown(self, birth_datetime, current_date):
+        """``age_breakdown(birth_datetime, current_date)`` using cached month steps"""
+        aware = birth_datetime.tzinfo is not None and current_date.tzinfo is not None
+        if aware:
+            # Calendar fields are counted in the reference zone, as in age_anchor
+            birth_wall = birth_datetime.astimezone(current_date.tzinfo).replace(tzinfo=None)
+            now_wall = current_date.replace(tzinfo=None)
+        else:
+            birth_wall, now_wall = birth_datetime, current_date
+        birth_date, today = birth_wall.date(), now_wall.date()
+        key = (birth_date, today)
+        steps = self.steps.get(key)
+        if steps is None:
+            self.misses += 1
+            midnight = datetime.time()
+            steps, _ = calendar_tables.month_steps(datetime.datetime.combine(birth_date, midnight),
+                                                   datetime.datetime.combine(today, midnight),
+                                                   self.feb29)
+            self.steps[key] = steps
+            if len(self.steps) > self.maxsize:
+                self.steps.popitem(last=False)
+        else:
+            self.hits += 1
+            self.steps.move_to_end(key)
+        anniversary = datetime.datetime.combine(
+            calendar_tables.shift_date(birth_date, steps, self.feb29), birth_wall.time())
+        if anniversary > now_wall:
+            return age_breakdown(birth_datetime, current_date, self.feb29)
+        if aware:
+            anniversary = anniversary.replace(tzinfo=current_date.tzinfo)
+        delta = elapsed(current_date, anniversary)
+        seconds = delta.seconds
+        years, months = divmod(steps, 12)
+        return AgeBreakdown(years, months, delta.days,
+                            seconds // 3600, (seconds % 3600) // 60, seconds % 60)
@@ -0,0 +1,168 @@
+"""Time zone support backed by the standard library's ``zoneinfo`` data.
+
+For batch work each zone's UTC-offset history is flattened once into NumPy
+transition tables (cached per zone and year range), so converting millions
+of timestamps is a ``searchsorted`` instead of one tzinfo call per row.
+
+Local times that fall into a DST gap or fold resolve like ``fold=0`` in the
+standard library: the offset in force before the transition is used.
+"""
+import datetime
+import os
+from functools import lru_cache
+from typing import NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+import numpy as np
+
+DEFAULT_YEAR_RANGE = (1900, 2100)
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_DAY = 86400
+
+
+class OffsetTable(NamedTuple):
+    # offsets[i] is in force from transitions[i - 1] (UTC seconds) up to
+    # transitions[i]; local_transitions are the same points in local time
+    transitions: np.ndarray
+    local_transitions: np.ndarray
+    offsets: np.ndarray
+
+
+def get_zone(name):
+    """ZoneInfo for ``name``, raising ValueError for unknown zones"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone {name!r}") from None
+
+
+def local_zone():
+    """The system's zone as a ZoneInfo when it can be named, else a fixed offset"""
+    names = [os.environ.get('TZ', '').lstrip(':')]
+    try:
+        path = os.path.realpath('/etc/localtime')
+        if 'zoneinfo/' in path:
+            names.append(path.split('zoneinfo/', 1)[1])
+    except OSError:
+        pass
+    for name in names:
+        if name:
+            try:
+                return ZoneInfo(name)
+            except (ZoneInfoNotFoundError, ValueError):
+                continue
+    return datetime.datetime.now().astimezone().tzinfo
+
+
+def zone_name(zone):
+    return getattr(zone, 'key', None) or str(zone)
+
+
+@lru_cache(maxsize=1)
+def zone_names():
+    """Sorted names of all zones in the installed tz database"""
+    return sorted(available_timezones())
+
+
+def _offset_at(zone, seconds):
+    moment = _EPOCH + datetime.timedelta(seconds=seconds)
+    return int(moment.astimezone(zone).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=None)
+def offset_table(name, years=DEFAULT_YEAR_RANGE):
+    """Build the transition table for zone ``name`` over ``years`` (inclusive).
+
+    The zone is sampled once a day and each change is narrowed down to the
+    exact second, so transitions less than a day apart are not resolved.
+    Outside the range the first and last offsets are assumed to continue.
+    """
+    zone = get_zone(name)
+    start = int((datetime.datetime(years[0], 1, 1, tzinfo=datetime.timezone.utc)
+                 - _EPOCH).total_seconds())
+    stop = int((datetime.datetime(years[1] + 1, 1, 1, tzinfo=datetime.timezone.utc)
+                - _EPOCH).total_seconds())
+    transitions, offsets = [], [_offset_at(zone, start)]
+    previous = start
+    for day in range(start + _DAY, stop + 1, _DAY):
+        offset = _offset_at(zone, day)
+        if offset == offsets[-1]:
+            previous = day
+            continue
+        lo, hi = previous, day
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _offset_at(zone, mid) == offsets[-1]:
+                lo = mid
+            else:
+                hi = mid
+        transitions.append(hi)
+        offsets.append(offset)
+        previous = day
+    transitions = np.array(transitions, dtype=np.int64)
+    offsets = np.array(offsets, dtype=np.int64)
+    local_transitions = transitions + np.maximum(offsets[:-1], offsets[1:])
+    return OffsetTable(transitions, local_transitions, offsets)
+
+
+def _seconds(values):
+    return np.asarray(values, dtype='datetime64[s]').astype(np.int64)
+
+
+def utc_offsets(utc, name, years=DEFAULT_YEAR_RANGE):
+    """UTC offsets in seconds in force at the UTC instants ``utc``"""
+    table = offset_table(name, years)
+    return table.offsets[np.searchsorted(table.transitions, _seconds(utc), 'right')]
+
+
+def utc_to_local(utc, name, years=DEFAULT_YEAR_RANGE):
+    """Convert naive UTC datetime64 values to wall-clock time in zone ``name``"""
+    seconds = _seconds(utc)
+    table = offset_table(name, years)
+    offsets = table.offsets[np.searchsorted(table.transitions, seconds, 'right')]
+    return (seconds + offsets).astype('datetime64[s]')
+
+
+def local_to_utc(local, name, years=DEFAULT_YEAR_RANGE):
+    """Convert naive wall-clock datetime64 values in zone ``name`` to UTC"""
+    seconds = _seconds(local)
+    table = offset_table(name, years)
+    offsets = table.offsets[np.searchsorted(table.local_transitions, seconds, 'right')]
+    return (seconds - offsets).astype('datetime64[s]')
+
+
+def _by_zone(values, zones, convert):
+    """Apply ``convert(values, zone)`` per zone when ``zones`` varies per row"""
+    if zones is None:
+        return values.astype('datetime64[s]')
+    if isinstance(zones, str):
+        return convert(values, zones)
+    zones = np.asarray(zones)
+    result = np.empty(values.shape, dtype='datetime64[s]')
+    names, inverse = np.unique(zones, return_inverse=True)
+    for i, name in enumerate(names):
+        mask = inverse == i
+        result[mask] = convert(values[mask], str(name)) if name else values[mask]
+    return result
+
+
+def to_utc(local, zones):
+    """Vectorised local -> UTC where ``zones`` is one name or one per row.
+
+    Rows with an empty zone name (or ``zones=None``) are taken as UTC.
+    """
+    local = np.asarray(local, dtype='datetime64[s]')
+    return _by_zone(local, zones, local_to_utc)
+
+
+def from_utc(utc, zones):
+    """Vectorised UTC -> local wall time, the inverse of ``to_utc``"""
+    utc = np.broadcast_to(np.asarray(utc, dtype='datetime64[s]'), np.shape(zones)
+                          if zones is not None and not isinstance(zones, str)
+                          else np.shape(utc))
+    return _by_zone(utc, zones, utc_to_local)
+
+
+def utc_now():
+    """Current time as a naive datetime64[s] in UTC"""
+    return np.datetime64(datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None), 's')